@@ -0,0 +1,110 @@
+import asyncio
+from typing import AsyncIterator, Iterator, Optional
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointTuple
+from app.config import get_settings
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """LangGraph checkpointer backed by the shared Redis client.
+
+    Each thread is a hash of checkpoint timestamp -> serialized checkpoint.
+    Only the newest `keep` checkpoints are retained and the whole thread
+    expires `ttl` seconds after its last write, like the interview state it
+    replaces. `retain_thread` extends that; later writes never shorten it.
+    """
+
+    def __init__(self, prefix: str = "interview_checkpoint:", ttl: int = None, keep: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+        self.ttl = ttl or settings.INTERVIEW_STATE_TTL
+        self.keep = keep
+
+    def _key(self, config: RunnableConfig) -> str:
+        return self.prefix + str(config["configurable"]["thread_id"])
+
+    def _tuple(self, thread_id: str, ts: str, data: str) -> CheckpointTuple:
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "thread_ts": ts}},
+            checkpoint=self.serde.loads(data.encode("utf-8"))
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        key = self._key(config)
+        ts = config["configurable"].get("thread_ts")
+        if ts is None:
+            # ISO timestamps sort chronologically
+            stamps = redis_client.client.hkeys(key)
+            if not stamps:
+                return None
+            ts = max(stamps)
+        data = redis_client.client.hget(key, ts)
+        return self._tuple(thread_id, ts, data) if data else None
+
+    def list(
+        self,
+        config: RunnableConfig,
+        *,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoints = redis_client.client.hgetall(self._key(config))
+        for ts in sorted(checkpoints, reverse=True):
+            if before and ts >= before["configurable"]["thread_ts"]:
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield self._tuple(thread_id, ts, checkpoints[ts])
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        key = self._key(config)
+
+        pipe = redis_client.client.pipeline()
+        pipe.hset(key, checkpoint["ts"], self.serde.dumps(checkpoint).decode("utf-8"))
+        # NX sets a fresh thread's expiry, GT only ever extends an existing one
+        pipe.expire(key, self.ttl, nx=True)
+        pipe.expire(key, self.ttl, gt=True)
+        pipe.hkeys(key)
+        stamps = pipe.execute()[-1]
+
+        stale = sorted(stamps)[:-self.keep]
+        if stale:
+            redis_client.client.hdel(key, *stale)
+
+        return {"configurable": {"thread_id": thread_id, "thread_ts": checkpoint["ts"]}}
+
+    def retain_thread(self, thread_id: str, ttl: int):
+        """Keep a thread's checkpoints for at least `ttl` more seconds"""
+        key = self.prefix + str(thread_id)
+        pipe = redis_client.client.pipeline()
+        pipe.expire(key, ttl, nx=True)
+        pipe.expire(key, ttl, gt=True)
+        pipe.execute()
+
+    def delete_thread(self, thread_id: str):
+        """Drop every checkpoint of a thread"""
+        redis_client.delete(self.prefix + str(thread_id))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig,
+        *,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint in await asyncio.to_thread(lambda: list(self.list(config, before=before, limit=limit))):
+            yield checkpoint
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint)
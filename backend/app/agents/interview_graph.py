@@ -1,23 +1,85 @@
 from langgraph.graph import StateGraph, END
-from typing import TypedDict, List, Dict, Annotated
-import operator
+from typing import AsyncIterator, Optional, TypedDict, List, Dict, Annotated
+import asyncio
+from app.agents.checkpointer import RedisCheckpointSaver
+from app.agents.question_speculator import QuestionSpeculator
+from app.agents.session_store import session_store
+from app.services.evaluation_service import evaluation_service
+from app.services.question_bank import question_bank
+from app.services.turn_scoring import SCORES_FORMAT, parse_turn_scores
+from app.config import get_settings
+from app.services.llm_scheduler import Priority
 from app.services.llm_service import llm_service
 
+settings = get_settings()
+
+# Turns kept in the checkpoint; prompts only look at the last few
+RECENT_HISTORY_TURNS = 6
+
+def keep_recent(history: List[Dict], new: List[Dict]) -> List[Dict]:
+    return (history + new)[-RECENT_HISTORY_TURNS:]
+
 class InterviewState(TypedDict):
+    interview_id: int
     role: str
     difficulty: str
     user_profile: Dict
-    conversation_history: Annotated[List[Dict], operator.add]
+    recent_history: Annotated[List[Dict], keep_recent]
     current_question: str
     question_count: int
     max_questions: int
-    evaluation_notes: Annotated[List[str], operator.add]
     thinking_process: str
     user_response: str
     should_end: bool
 
 class InterviewGraph:
-    def __init__(self):
+    """Interview workflow, run one turn per call.
+
+    State is checkpointed in Redis per interview (thread_id = interview id)
+    and the graph pauses after each question, so each call resumes from the
+    last checkpoint, handles one answer, asks the next question and stops to
+    wait for the candidate. `analyze_response` and `provide_feedback` only
+    read the question and answer, so they run as parallel branches that join
+    at `decide_next`. Nodes are async and return partial updates; LLM calls
+    are awaited, so concurrent interviews on one worker overlap their I/O.
+
+    The checkpoint only holds scalar fields and the last few turns. Every
+    turn and evaluation note is appended to the `session_store` lists, and
+    `acollect_state` reads them back in full when the interview completes.
+    Each note carries the answer's dimension scores, which `session_store`
+    also folds into running per-interview averages.
+
+    With `background_analysis` the evaluation note is only needed for the
+    final report, so `analyze_response` leaves the graph and runs as a
+    background task after the answer is recorded. `acollect_state` waits
+    for outstanding analyses before reading the notes.
+
+    With `background_summaries` the older transcript chunks the evaluation
+    prompt will summarize are summarized as each chunk closes, off the
+    turn's critical path, and kept in `session_store`; `acollect_state`
+    returns them so the evaluation only summarizes what is left.
+    
+    With `speculative_questions` a candidate next question is generated
+    while the candidate answers (see `QuestionSpeculator`).
+    
+    With `use_question_bank` the opening question is taken from the
+    pre-generated pool for the role and difficulty (see `QuestionBank`),
+    falling back to the LLM when the pool is empty.
+    """
+    
+    def __init__(self, background_analysis: bool = None, speculative_questions: bool = None, use_question_bank: bool = None, background_summaries: bool = None):
+        self.background_analysis = settings.INTERVIEW_BACKGROUND_ANALYSIS if background_analysis is None else background_analysis
+        # Nodes that need the candidate's answer
+        self.answer_nodes = ["provide_feedback"] if self.background_analysis else ["analyze_response", "provide_feedback"]
+        # Latest background analysis per interview; each one waits for its predecessor
+        self._analyses: Dict[int, asyncio.Task] = {}
+        self.background_summaries = settings.INTERVIEW_BACKGROUND_SUMMARIES if background_summaries is None else background_summaries
+        # Running summary pass per interview; a turn that finds one running skips its own
+        self._summarizing: Dict[int, asyncio.Task] = {}
+        speculate = settings.INTERVIEW_SPECULATIVE_QUESTIONS if speculative_questions is None else speculative_questions
+        self.speculator = QuestionSpeculator() if speculate else None
+        self.use_question_bank = settings.QUESTION_BANK_ENABLED if use_question_bank is None else use_question_bank
+        self.checkpointer = RedisCheckpointSaver()
         self.graph = self.build_graph()
     
     def build_graph(self):
@@ -27,16 +89,22 @@ class InterviewGraph:
         # Add nodes
         workflow.add_node("initialize", self.initialize_interview)
         workflow.add_node("generate_question", self.generate_question)
-        workflow.add_node("analyze_response", self.analyze_response)
         workflow.add_node("provide_feedback", self.provide_feedback)
         workflow.add_node("decide_next", self.decide_next_step)
         
         # Add edges
         workflow.set_entry_point("initialize")
         workflow.add_edge("initialize", "generate_question")
-        workflow.add_edge("generate_question", "analyze_response")
-        workflow.add_edge("analyze_response", "provide_feedback")
-        workflow.add_edge("provide_feedback", "decide_next")
+        
+        if self.background_analysis:
+            workflow.add_edge("generate_question", "provide_feedback")
+            workflow.add_edge("provide_feedback", "decide_next")
+        else:
+            # Fan out to both post-answer nodes, join before deciding
+            workflow.add_node("analyze_response", self.analyze_response)
+            workflow.add_edge("generate_question", "analyze_response")
+            workflow.add_edge("generate_question", "provide_feedback")
+            workflow.add_edge(["analyze_response", "provide_feedback"], "decide_next")
         
         # Conditional edge
         workflow.add_conditional_edges(
@@ -48,25 +116,211 @@ class InterviewGraph:
             }
         )
         
-        return workflow.compile()
+        # Pause for the candidate's answer after every question
+        return workflow.compile(
+            checkpointer=self.checkpointer,
+            interrupt_before=self.answer_nodes
+        )
     
-    def initialize_interview(self, state: InterviewState) -> InterviewState:
-        """Initialize the interview session"""
-        state["question_count"] = 0
-        state["max_questions"] = 10  # Default
-        state["should_end"] = False
-        state["conversation_history"] = []
-        state["evaluation_notes"] = []
+    def _config(self, interview_id: int) -> Dict:
+        return {"configurable": {"thread_id": str(interview_id)}}
+    
+    async def start(self, state: InterviewState) -> Dict:
+        """Initialize the interview and ask the first question"""
+        await self.graph.ainvoke(state, self._config(state["interview_id"]))
+        state = await self.aget_state(state["interview_id"])
+        self._speculate(state)
+        return state
+    
+    async def respond(self, interview_id: int, message: Dict) -> Dict:
+        """Resume with the candidate's answer and run one turn"""
+        config = self._config(interview_id)
+        await self._add_response(config, message)
+        await self.graph.ainvoke(None, config)
+        state = await self.aget_state(interview_id)
+        self._speculate(state)
+        self._schedule_summaries(interview_id)
+        return state
+    
+    async def astream_respond(self, interview_id: int, message: Dict) -> AsyncIterator[str]:
+        """Like `respond`, but yields the next question's tokens as they arrive"""
+        config = self._config(interview_id)
+        await self._add_response(config, message)
+        
+        # Stop before generate_question too, so the question can be streamed
+        await self.graph.ainvoke(None, config, interrupt_before=self.answer_nodes + ["generate_question"])
+        snapshot = await self.graph.aget_state(config)
+        if "generate_question" not in snapshot.next:
+            return
+        
+        state = dict(snapshot.values)
+        async for token in self.astream_question(state):
+            yield token
         
-        state["thinking_process"] = f"Initializing interview for {state['role']} position..."
+        # Record the streamed question as the node's output; the graph then
+        # pauses for the next answer as usual
+        await self.graph.aupdate_state(
+            config,
+            {
+                "current_question": state["current_question"],
+                "question_count": state["question_count"],
+                "thinking_process": state["thinking_process"]
+            },
+            as_node="generate_question"
+        )
+        self._speculate(state)
+        self._schedule_summaries(interview_id)
+    
+    def get_state(self, interview_id: int) -> Optional[Dict]:
+        """Latest checkpointed state of an interview, if any"""
+        values = self.graph.get_state(self._config(interview_id)).values
+        return dict(values) if values else None
+    
+    async def aget_state(self, interview_id: int) -> Optional[Dict]:
+        values = (await self.graph.aget_state(self._config(interview_id))).values
+        return dict(values) if values else None
+    
+    async def acollect_state(self, interview_id: int) -> Optional[Dict]:
+        """State with the full conversation and every evaluation note, once background analyses are done"""
+        task = self._analyses.get(interview_id)
+        if task is not None:
+            await asyncio.shield(task)
         
+        state = await self.aget_state(interview_id)
+        if state is not None:
+            state["conversation_history"] = await session_store.aturns(interview_id)
+            state["evaluation_notes"] = await session_store.anotes(interview_id)
+            state["running_scores"] = await session_store.arunning_scores(interview_id)
+            state["transcript_summaries"] = await session_store.asummaries(interview_id)
         return state
     
-    def generate_question(self, state: InterviewState) -> InterviewState:
+    def end(self, interview_id: int):
+        """Stop in-process work for an ended interview; its stored state is kept for evaluation"""
+        if self.speculator is not None:
+            self.speculator.discard(interview_id)
+    
+    def retain(self, interview_id: int, ttl: int):
+        """Keep an ended interview's stored state for at least `ttl` more seconds, until it is evaluated"""
+        self.checkpointer.retain_thread(str(interview_id), ttl)
+        session_store.retain(interview_id, ttl)
+    
+    def clear(self, interview_id: int):
+        """Drop an interview's checkpoints and stored turns"""
+        self.checkpointer.delete_thread(str(interview_id))
+        session_store.delete(interview_id)
+        self.end(interview_id)
+    
+    def _speculate(self, state: Dict):
+        if self.speculator is not None and state is not None:
+            self.speculator.speculate(state)
+    
+    def _take_speculation(self, state: InterviewState) -> Optional[str]:
+        return self.speculator.take(state) if self.speculator is not None else None
+    
+    async def _take_prepared(self, state: InterviewState) -> Optional[str]:
+        """A question that needs no generation: banked for the opener, else speculative"""
+        if not state["recent_history"]:
+            if not self.use_question_bank:
+                return None
+            return await asyncio.to_thread(question_bank.take, state["role"], state["difficulty"], state["user_profile"].get("skills", []))
+        return self._take_speculation(state)
+    
+    async def _add_response(self, config: Dict, message: Dict):
+        interview_id = int(config["configurable"]["thread_id"])
+        await session_store.append_turns(interview_id, [message])
+        
+        if self.background_analysis:
+            state = await self.aget_state(interview_id)
+            self._schedule_analysis(interview_id, state["current_question"], message["content"])
+        
+        # Written as generate_question's output so the answer nodes run next
+        await self.graph.aupdate_state(
+            config,
+            {"user_response": message["content"], "recent_history": [message]},
+            as_node="generate_question"
+        )
+    
+    def _schedule_analysis(self, interview_id: int, question: str, response: str):
+        previous = self._analyses.get(interview_id)
+        task = asyncio.ensure_future(self._analyze_in_background(interview_id, question, response, previous))
+        self._analyses[interview_id] = task
+        
+        def forget(done):
+            if self._analyses.get(interview_id) is done:
+                del self._analyses[interview_id]
+        task.add_done_callback(forget)
+    
+    async def _analyze_in_background(self, interview_id: int, question: str, response: str, previous: Optional[asyncio.Task]):
+        note = await self._analyze(question, response, Priority.EVALUATION)
+        
+        # Keep notes in answer order even if a later analysis finishes first
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        
+        await session_store.append_notes(interview_id, [note])
+    
+    def _schedule_summaries(self, interview_id: int):
+        if not self.background_summaries or interview_id in self._summarizing:
+            return
+        task = asyncio.ensure_future(self._summarize_in_background(interview_id))
+        self._summarizing[interview_id] = task
+        task.add_done_callback(lambda _: self._summarizing.pop(interview_id, None))
+    
+    async def _summarize_in_background(self, interview_id: int):
+        # Only when a chunk of turns has just closed; summaries cover whole chunks
+        if await asyncio.to_thread(session_store.turn_count, interview_id) % settings.EVAL_SUMMARY_CHUNK_TURNS:
+            return
+        try:
+            turns, notes, summaries = await asyncio.gather(
+                session_store.aturns(interview_id),
+                session_store.anotes(interview_id),
+                session_store.asummaries(interview_id)
+            )
+            known = len(summaries)
+            await evaluation_service.asummarize_transcript(turns, notes, summaries)
+            if len(summaries) > known:
+                await session_store.astore_summaries(interview_id, summaries)
+        except Exception as e:
+            print(f"Transcript summaries for interview {interview_id} failed: {e}")
+    
+    async def initialize_interview(self, state: InterviewState) -> Dict:
+        """Initialize the interview session"""
+        return {
+            "question_count": 0,
+            "max_questions": state.get("max_questions") or 10,
+            "should_end": False,
+            "thinking_process": f"Initializing interview for {state['role']} position..."
+        }
+    
+    async def generate_question(self, state: InterviewState) -> Dict:
         """Generate next interview question"""
+        question = await self._take_prepared(state) or await llm_service.agenerate(**self._question_request(state))
+        
+        return {
+            "thinking_process": "Analyzing candidate profile and generating next question...",
+            "current_question": question,
+            "question_count": state["question_count"] + 1
+        }
+    
+    async def astream_question(self, state: InterviewState) -> AsyncIterator[str]:
+        """Generate next interview question, yielding tokens as they arrive"""
         state["thinking_process"] = "Analyzing candidate profile and generating next question..."
         
-        # Build context
+        chunks = []
+        prepared = await self._take_prepared(state)
+        if prepared:
+            chunks.append(prepared)
+            yield prepared
+        else:
+            async for token in llm_service.astream(**self._question_request(state)):
+                chunks.append(token)
+                yield token
+        
+        state["current_question"] = "".join(chunks).strip()
+        state["question_count"] += 1
+    
+    def _question_request(self, state: InterviewState) -> Dict:
+        """Build the LLM request for the next question"""
         context = f"""
 You are an experienced interviewer conducting a {state['difficulty']} level interview for a {state['role']} position.
 
@@ -76,7 +330,7 @@ Candidate Profile:
 - Target Roles: {', '.join(state['user_profile'].get('target_roles', []))}
 
 Previous conversation:
-{self._format_conversation(state['conversation_history'])}
+{self._format_conversation(state['recent_history'])}
 
 Generate the next interview question. The question should:
 1. Be relevant to the role and candidate's background
@@ -87,30 +341,37 @@ Generate the next interview question. The question should:
 Question {state['question_count'] + 1}:
 """
         
-        question = llm_service.generate(
-            prompt=context,
-            system_prompt="You are an expert interviewer. Generate one clear, focused interview question.",
-            max_new_tokens=200,
-            temperature=0.8
-        )
-        
-        state["current_question"] = question
-        state["question_count"] += 1
-        
-        return state
+        return {
+            "prompt": context,
+            "system_prompt": "You are an expert interviewer. Generate one clear, focused interview question.",
+            "max_new_tokens": 200,
+            "temperature": 0.8,
+            "call_site": "generate_question",
+            # The opening question only depends on role, difficulty and profile
+            "cache": not state["recent_history"],
+            # Lets backends reuse the encoded role/profile preamble across turns
+            "session_id": str(state["interview_id"]) if state.get("interview_id") else None
+        }
     
-    def analyze_response(self, state: InterviewState) -> InterviewState:
+    async def analyze_response(self, state: InterviewState) -> Dict:
         """Analyze user's response"""
         if not state.get("user_response"):
-            return state
+            return {}
         
-        state["thinking_process"] = "Analyzing response quality and depth..."
+        note = await self._analyze(state["current_question"], state["user_response"], Priority.INTERACTIVE)
+        await session_store.append_notes(state["interview_id"], [note])
         
+        # thinking_process is left to provide_feedback; parallel branches
+        # cannot both write the same channel in one step
+        return {}
+    
+    async def _analyze(self, question: str, response: str, priority: Priority) -> Dict:
+        """Evaluation note for one answer"""
         analysis_prompt = f"""
 Analyze this interview response:
 
-Question: {state['current_question']}
-Response: {state['user_response']}
+Question: {question}
+Response: {response}
 
 Evaluate the response on:
 1. Relevance and directness
@@ -119,26 +380,29 @@ Evaluate the response on:
 4. Depth of knowledge
 5. Problem-solving approach
 
-Provide brief evaluation notes (2-3 sentences):
+Provide brief evaluation notes (2-3 sentences).
+{SCORES_FORMAT}
+Evaluation:
 """
         
-        evaluation = llm_service.generate(
+        text = await llm_service.agenerate(
             prompt=analysis_prompt,
             system_prompt="You are an expert interviewer evaluating candidate responses.",
-            max_new_tokens=150
+            max_new_tokens=200,
+            priority=priority,
+            call_site="analyze_response"
         )
+        evaluation, scores = parse_turn_scores(text)
         
-        state["evaluation_notes"].append({
-            "question": state["current_question"],
-            "response": state["user_response"],
-            "evaluation": evaluation
-        })
-        
-        return state
+        return {
+            "question": question,
+            "response": response,
+            "evaluation": evaluation,
+            "scores": scores
+        }
     
-    def provide_feedback(self, state: InterviewState) -> InterviewState:
+    async def provide_feedback(self, state: InterviewState) -> Dict:
         """Provide immediate feedback or follow-up"""
-        state["thinking_process"] = "Formulating follow-up or feedback..."
         
         feedback_prompt = f"""
 Based on the candidate's response, provide a brief acknowledgment and decide if a follow-up question is needed.
@@ -153,25 +417,27 @@ Provide either:
 Keep it conversational and natural:
 """
         
-        feedback = llm_service.generate(
+        feedback = await llm_service.agenerate(
             prompt=feedback_prompt,
             max_new_tokens=100,
-            temperature=0.7
+            temperature=0.7,
+            call_site="provide_feedback"
         )
         
-        state["conversation_history"].append({
+        message = {
             "role": "interviewer",
             "content": feedback
-        })
+        }
+        await session_store.append_turns(state["interview_id"], [message])
         
-        return state
+        return {
+            "thinking_process": "Analyzing response and formulating follow-up...",
+            "recent_history": [message]
+        }
     
-    def decide_next_step(self, state: InterviewState) -> InterviewState:
+    async def decide_next_step(self, state: InterviewState) -> Dict:
         """Decide whether to continue or end interview"""
-        if state["question_count"] >= state["max_questions"]:
-            state["should_end"] = True
-        
-        return state
+        return {"should_end": state["question_count"] >= state["max_questions"]}
     
     def should_continue(self, state: InterviewState) -> str:
         """Determine if interview should continue"""
@@ -0,0 +1,154 @@
+import re
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+from app.config import get_settings
+from app.services.llm_scheduler import Priority
+from app.services.llm_service import llm_loop, llm_service
+from app.utils.tokens import count_tokens
+
+settings = get_settings()
+
+_WORD = re.compile(r"[a-z][a-z0-9+#.-]{3,}")
+
+
+class QuestionSpeculator:
+    """Pre-generate the next question while the candidate is answering.
+
+    The speculative question is profile-driven and introduces a new topic,
+    so it does not depend on the answer. When the answer arrives, `take`
+    makes a cheap check and either returns it in place of a fresh
+    generation or discards it. A short answer, an interviewer follow-up, or
+    an answer that already covers the new topic all mean the next question
+    should build on the answer instead. Speculative calls run at BACKFILL
+    priority so they never hold up live turns.
+    """
+
+    def __init__(self, min_answer_words: int = None, max_overlap: float = None):
+        self.min_answer_words = min_answer_words if min_answer_words is not None else settings.INTERVIEW_SPECULATION_MIN_ANSWER_WORDS
+        self.max_overlap = max_overlap if max_overlap is not None else settings.INTERVIEW_SPECULATION_MAX_OVERLAP
+        # interview_id -> (question_count the speculation is for, pending generation)
+        self._pending: Dict[int, Tuple[int, Future]] = {}
+        self._lock = threading.Lock()
+        self.speculations = 0
+        self.hits = 0
+        self.misses: Dict[str, int] = {}
+        self.wasted_tokens = 0
+        self.saved_tokens = 0
+
+    def speculate(self, state: Dict):
+        """Start generating a candidate next question for this interview"""
+        if state.get("should_end") or state["question_count"] >= state["max_questions"]:
+            return
+
+        future = llm_loop.submit(llm_service.agenerate(**self._request(state)))
+        with self._lock:
+            self.speculations += 1
+            previous = self._pending.pop(state["interview_id"], None)
+            self._pending[state["interview_id"]] = (state["question_count"] + 1, future)
+        if previous is not None:
+            self._discard(previous[1], "superseded")
+
+    def take(self, state: Dict) -> Optional[str]:
+        """Return the speculative question for this turn if it is still a good fit"""
+        with self._lock:
+            entry = self._pending.pop(state["interview_id"], None)
+        if entry is None:
+            return None
+
+        target, future = entry
+        if target != state["question_count"] + 1:
+            self._discard(future, "stale")
+            return None
+        if not future.done():
+            self._discard(future, "not_ready")
+            return None
+
+        question = future.result()
+        reason = self._reject_reason(question, state)
+        if reason:
+            self._discard(future, reason)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.saved_tokens += count_tokens(question)
+        return question
+
+    def discard(self, interview_id: int):
+        """Drop any speculation for an interview that has ended"""
+        with self._lock:
+            entry = self._pending.pop(interview_id, None)
+        if entry is not None:
+            self._discard(entry[1], "abandoned")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            decided = self.hits + sum(self.misses.values())
+            return {
+                "speculations": self.speculations,
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": dict(self.misses),
+                "hit_rate": round(self.hits / decided, 4) if decided else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "wasted_tokens": self.wasted_tokens
+            }
+
+    def _discard(self, future: Future, reason: str):
+        # Tokens of a finished speculation are wasted; an unfinished one is cancelled
+        wasted = 0
+        if future.done() and not future.cancelled():
+            wasted = count_tokens(future.result() or "")
+        else:
+            future.cancel()
+        with self._lock:
+            self.misses[reason] = self.misses.get(reason, 0) + 1
+            self.wasted_tokens += wasted
+
+    def _reject_reason(self, question: str, state: Dict) -> Optional[str]:
+        if not question:
+            return "empty"
+
+        answer = state.get("user_response", "")
+        if len(answer.split()) < self.min_answer_words:
+            return "short_answer"
+
+        # provide_feedback asks a follow-up when the answer is worth digging into
+        history = state.get("recent_history", [])
+        if history and history[-1]["role"] == "interviewer" and "?" in history[-1]["content"]:
+            return "follow_up"
+
+        question_words = set(_WORD.findall(question.lower()))
+        answer_words = set(_WORD.findall(answer.lower()))
+        if question_words and len(question_words & answer_words) / len(question_words) > self.max_overlap:
+            return "topic_covered"
+
+        return None
+
+    def _request(self, state: Dict) -> Dict:
+        profile = state["user_profile"]
+        prompt = f"""
+You are an experienced interviewer conducting a {state['difficulty']} level interview for a {state['role']} position.
+
+Candidate Profile:
+- Skills: {', '.join(profile.get('skills', []))}
+- Experience: {profile.get('experience_years', 0)} years
+- Target Roles: {', '.join(profile.get('target_roles', []))}
+
+The last question asked was:
+{state['current_question']}
+
+Generate the next interview question. It should open a new topic drawn from the candidate's profile and the role, not follow up on the last question, and match the {state['difficulty']} difficulty level.
+
+Question {state['question_count'] + 1}:
+"""
+
+        return {
+            "prompt": prompt,
+            "system_prompt": "You are an expert interviewer. Generate one clear, focused interview question.",
+            "max_new_tokens": 200,
+            "temperature": 0.8,
+            "priority": Priority.BACKFILL,
+            "call_site": "speculative_question"
+        }
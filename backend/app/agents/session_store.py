@@ -0,0 +1,143 @@
+import asyncio
+import json
+from typing import Dict, List
+from app.config import get_settings
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+
+class SessionStore:
+    """Append-only Redis storage for the parts of an interview that grow.
+
+    Turns and evaluation notes are pushed to per-interview lists as they
+    happen and are only read back in full when the interview completes, so
+    the work per turn stays flat however long the interview runs. The graph
+    checkpoint keeps just the scalar fields and a short window of recent
+    turns. Per-answer scores are also summed into a hash as notes arrive,
+    so running averages are available without reading the notes back.
+    Transcript chunk summaries made during the interview are kept in a
+    hash too, for the evaluation to reuse.
+
+    Keys expire `ttl` seconds after their last write. `retain` extends them
+    for a completed interview waiting on its evaluation job; later writes
+    never shorten an expiry.
+    """
+
+    def __init__(self, ttl: int = None):
+        self.ttl = ttl or settings.INTERVIEW_STATE_TTL
+
+    def _turns_key(self, interview_id: int) -> str:
+        return f"interview_turns:{interview_id}"
+
+    def _notes_key(self, interview_id: int) -> str:
+        return f"interview_analysis:{interview_id}"
+
+    def _scores_key(self, interview_id: int) -> str:
+        return f"interview_scores:{interview_id}"
+
+    def _summaries_key(self, interview_id: int) -> str:
+        return f"interview_summaries:{interview_id}"
+
+    def _expire(self, pipe, key: str, ttl: int = None):
+        # NX sets a fresh key's expiry, GT only ever extends an existing one
+        pipe.expire(key, ttl or self.ttl, nx=True)
+        pipe.expire(key, ttl or self.ttl, gt=True)
+
+    def _append(self, key: str, items: List[Dict], pipe=None):
+        if not items:
+            return
+        pipe = pipe or redis_client.client.pipeline()
+        pipe.rpush(key, *[json.dumps(item) for item in items])
+        self._expire(pipe, key)
+        pipe.execute()
+
+    def _read(self, key: str) -> List[Dict]:
+        return [json.loads(item) for item in redis_client.client.lrange(key, 0, -1)]
+
+    async def append_turns(self, interview_id: int, messages: List[Dict]):
+        await asyncio.to_thread(self._append, self._turns_key(interview_id), messages)
+
+    def _append_notes(self, interview_id: int, notes: List[Dict]):
+        # Running sums and counts per dimension, updated with the notes themselves
+        key = self._scores_key(interview_id)
+        pipe = redis_client.client.pipeline()
+        for note in notes:
+            for name, value in note.get("scores", {}).items():
+                pipe.hincrbyfloat(key, f"{name}:sum", value)
+                pipe.hincrby(key, f"{name}:count", 1)
+        self._expire(pipe, key)
+        self._append(self._notes_key(interview_id), notes, pipe)
+
+    async def append_notes(self, interview_id: int, notes: List[Dict]):
+        await asyncio.to_thread(self._append_notes, interview_id, notes)
+
+    def turns(self, interview_id: int) -> List[Dict]:
+        """Full conversation of an interview"""
+        return self._read(self._turns_key(interview_id))
+
+    async def aturns(self, interview_id: int) -> List[Dict]:
+        return await asyncio.to_thread(self.turns, interview_id)
+
+    def turn_count(self, interview_id: int) -> int:
+        return redis_client.client.llen(self._turns_key(interview_id))
+
+    async def anotes(self, interview_id: int) -> List[Dict]:
+        """Evaluation notes of an interview, in answer order"""
+        return await asyncio.to_thread(self._read, self._notes_key(interview_id))
+
+    def note_count(self, interview_id: int) -> int:
+        return redis_client.client.llen(self._notes_key(interview_id))
+
+    def running_scores(self, interview_id: int) -> Dict[str, float]:
+        """Average score so far per dimension, over the answers analyzed yet"""
+        totals = redis_client.client.hgetall(self._scores_key(interview_id))
+        return {
+            field.split(":")[0]: round(float(totals[field]) / int(totals[field.replace(":sum", ":count")]), 1)
+            for field in totals if field.endswith(":sum")
+        }
+
+    async def arunning_scores(self, interview_id: int) -> Dict[str, float]:
+        return await asyncio.to_thread(self.running_scores, interview_id)
+
+    def summaries(self, interview_id: int) -> Dict[str, str]:
+        """Transcript chunk summaries, keyed as `TranscriptCompactor` keys them"""
+        return redis_client.client.hgetall(self._summaries_key(interview_id))
+
+    async def asummaries(self, interview_id: int) -> Dict[str, str]:
+        return await asyncio.to_thread(self.summaries, interview_id)
+
+    def _store_summaries(self, interview_id: int, summaries: Dict[str, str]):
+        if not summaries:
+            return
+        key = self._summaries_key(interview_id)
+        pipe = redis_client.client.pipeline()
+        pipe.hset(key, mapping=summaries)
+        self._expire(pipe, key)
+        pipe.execute()
+
+    async def astore_summaries(self, interview_id: int, summaries: Dict[str, str]):
+        await asyncio.to_thread(self._store_summaries, interview_id, summaries)
+
+    def retain(self, interview_id: int, ttl: int):
+        """Keep an interview's state for at least `ttl` more seconds"""
+        pipe = redis_client.client.pipeline()
+        for key in (
+            self._turns_key(interview_id),
+            self._notes_key(interview_id),
+            self._scores_key(interview_id),
+            self._summaries_key(interview_id)
+        ):
+            self._expire(pipe, key, ttl)
+        pipe.execute()
+
+    def delete(self, interview_id: int):
+        redis_client.client.delete(
+            self._turns_key(interview_id),
+            self._notes_key(interview_id),
+            self._scores_key(interview_id),
+            self._summaries_key(interview_id)
+        )
+
+
+session_store = SessionStore()
@@ -1,23 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.config import get_settings
 from app.utils.database import get_db
 from app.models.user import User
 from app.models.interview import Interview, Evaluation
 from app.api.auth import get_current_user
 from app.agents.interview_graph import interview_graph, InterviewState
-from app.services.evaluation_service import evaluation_service
-from app.services.stt_service import stt_service
+from app.agents.session_store import session_store
+from app.services.evaluation_queue import evaluation_queue
+from app.services.llm_service import llm_service
+from app.services.question_bank import INTERVIEW_ROLES
+from app.services.stt_service import IncrementalTranscriber, stt_service
 from app.services.tts_service import tts_service
-from app.utils.redis_client import redis_client
+from app.services.voice_pipeline import VoiceTurnPipeline
 from pydantic import BaseModel
 from datetime import datetime
 import json
 import asyncio
+import base64
 import os
 import tempfile
+import time
 
 router = APIRouter(prefix="/interviews", tags=["Interviews"])
+settings = get_settings()
+voice_pipeline = VoiceTurnPipeline()
 
 class InterviewCreate(BaseModel):
     role: str
@@ -46,17 +56,10 @@ def create_interview(
     """Create a new interview session"""
     
     # Validate role
-    valid_roles = [
-        "Software Engineer", "Data Scientist", "Product Manager",
-        "Sales Manager", "Marketing Manager", "Business Analyst",
-        "UI/UX Designer", "DevOps Engineer", "Project Manager",
-        "Customer Success Manager", "Retail Associate", "HR Manager"
-    ]
-    
-    if interview_data.role not in valid_roles:
+    if interview_data.role not in INTERVIEW_ROLES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid role. Choose from: {', '.join(valid_roles)}"
+            detail=f"Invalid role. Choose from: {', '.join(INTERVIEW_ROLES)}"
         )
     
     # Create interview
@@ -131,7 +134,10 @@ def get_interview(
         "difficulty": interview.difficulty,
         "status": interview.status,
         "duration_minutes": interview.duration_minutes,
-        "conversation_history": interview.conversation_history or [],
+        # Turns of a running interview are only written to the database on completion
+        "conversation_history": session_store.turns(interview.id) if interview.status == "in_progress" else interview.conversation_history or [],
+        # Average per-answer scores so far, while the interview runs
+        "running_scores": session_store.running_scores(interview.id) if interview.status == "in_progress" else None,
         "transcript": interview.transcript,
         "created_at": interview.created_at.isoformat(),
         "started_at": interview.started_at.isoformat() if interview.started_at else None,
@@ -139,7 +145,7 @@ def get_interview(
     }
 
 @router.post("/{interview_id}/start")
-def start_interview(
+async def start_interview(
     interview_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -162,6 +168,7 @@ def start_interview(
     
     # Initialize interview state
     initial_state = InterviewState(
+        interview_id=interview.id,
         role=interview.role,
         difficulty=interview.difficulty,
         user_profile={
@@ -170,30 +177,19 @@ def start_interview(
             "target_roles": current_user.target_roles or [],
             "education": current_user.education or {}
         },
-        conversation_history=[],
+        recent_history=[],
         current_question="",
         question_count=0,
         max_questions=10,
-        evaluation_notes=[],
         thinking_process="",
         user_response="",
         should_end=False
     )
     
-    # Store state in Redis
-    redis_client.set(f"interview_state:{interview_id}", initial_state, expire=3600)
-    
     db.commit()
     
-    # Generate first question
-    result = interview_graph.graph.invoke(initial_state)
-    
-    # Update Redis with new state
-    redis_client.set(f"interview_state:{interview_id}", result, expire=3600)
-    
-    # Save to database
-    interview.conversation_history = result.get("conversation_history", [])
-    db.commit()
+    # Generate the first question; the graph checkpoints and waits for the answer
+    result = await interview_graph.start(initial_state)
     
     return {
         "message": "Interview started",
@@ -220,50 +216,17 @@ async def respond_to_question(
     if interview.status != "in_progress":
         raise HTTPException(status_code=400, detail="Interview is not in progress")
     
-    # Get current state from Redis
-    state = redis_client.get(f"interview_state:{interview_id}")
-    
-    if not state:
+    if not await interview_graph.aget_state(interview_id):
         raise HTTPException(status_code=400, detail="Interview state not found")
     
     # Process audio if provided
     user_response = message_input.message
     
     if message_input.audio_data:
-        # Decode base64 audio and transcribe
-        import base64
-        audio_bytes = base64.b64decode(message_input.audio_data)
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            temp_audio.write(audio_bytes)
-            temp_audio_path = temp_audio.name
-        
-        try:
-            # Transcribe
-            transcription = stt_service.transcribe(temp_audio_path)
-            user_response = transcription["text"]
-        finally:
-            # Clean up
-            os.unlink(temp_audio_path)
-    
-    # Update state with user response
-    state["user_response"] = user_response
-    state["conversation_history"].append({
-        "role": "user",
-        "content": user_response,
-        "timestamp": datetime.utcnow().isoformat()
-    })
-    
-    # Process through graph
-    result = interview_graph.graph.invoke(state)
+        user_response = await run_in_threadpool(_transcribe_audio, message_input.audio_data)
     
-    # Update Redis
-    redis_client.set(f"interview_state:{interview_id}", result, expire=3600)
-    
-    # Save to database
-    interview.conversation_history = result.get("conversation_history", [])
-    db.commit()
+    # Run one turn from the checkpoint
+    result = await interview_graph.respond(interview_id, _user_message(user_response))
     
     # Check if interview should end
     if result.get("should_end", False):
@@ -279,7 +242,7 @@ async def respond_to_question(
         audio_path = os.path.join(audio_dir, f"response_{result['question_count']}.wav")
         
         try:
-            tts_service.synthesize(response_text, audio_path)
+            await run_in_threadpool(tts_service.synthesize, response_text, audio_path)
         except Exception as e:
             print(f"TTS generation failed: {e}")
             audio_path = None
@@ -292,12 +255,95 @@ async def respond_to_question(
         "audio_url": f"/audio/{interview_id}/response_{result['question_count']}.wav" if audio_path else None
     }
 
+def _transcribe_audio(audio_data: str) -> str:
+    """Decode base64 audio and transcribe it"""
+    audio_bytes = base64.b64decode(audio_data)
+    
+    # Save to temporary file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
+        temp_audio.write(audio_bytes)
+        temp_audio_path = temp_audio.name
+    
+    try:
+        # Transcribe
+        transcription = stt_service.transcribe(temp_audio_path)
+        return transcription["text"]
+    finally:
+        # Clean up
+        os.unlink(temp_audio_path)
+
+def _user_message(user_response: str) -> dict:
+    return {
+        "role": "user",
+        "content": user_response,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+async def _stream_turn(interview: Interview, user_response: str, db: Session):
+    """Run one interview turn, yielding events as the next question streams in"""
+    yield {"type": "thinking", "message": "Analyzing your response..."}
+    
+    streaming = False
+    async for token in interview_graph.astream_respond(interview.id, _user_message(user_response)):
+        if not streaming:
+            streaming = True
+            yield {"type": "thinking", "message": "Generating next question..."}
+        yield {"type": "token", "text": token}
+    
+    state = await interview_graph.aget_state(interview.id)
+    
+    if state.get("should_end", False):
+        result = await complete_interview(interview.id, interview.user, db)
+        yield {"type": "completed", **result}
+        return
+    
+    yield {
+        "type": "response",
+        "question": state.get("current_question", ""),
+        "thinking_process": state.get("thinking_process", ""),
+        "question_count": state.get("question_count", 0),
+        "max_questions": state.get("max_questions", 10)
+    }
+
+@router.post("/{interview_id}/respond/stream")
+async def respond_to_question_stream(
+    interview_id: int,
+    message_input: MessageInput,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Submit a response and stream the next question as server-sent events"""
+    interview = db.query(Interview).filter(
+        Interview.id == interview_id,
+        Interview.user_id == current_user.id
+    ).first()
+    
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    if interview.status != "in_progress":
+        raise HTTPException(status_code=400, detail="Interview is not in progress")
+    
+    if not await interview_graph.aget_state(interview_id):
+        raise HTTPException(status_code=400, detail="Interview state not found")
+    
+    user_response = message_input.message
+    
+    if message_input.audio_data:
+        user_response = await run_in_threadpool(_transcribe_audio, message_input.audio_data)
+    
+    async def event_stream():
+        async for event in _stream_turn(interview, user_response, db):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 async def complete_interview(
     interview_id: int,
     current_user: User,
     db: Session
 ):
-    """Complete interview and generate evaluation"""
+    """Complete interview and queue its evaluation"""
     interview = db.query(Interview).filter(
         Interview.id == interview_id,
         Interview.user_id == current_user.id
@@ -306,73 +352,68 @@ async def complete_interview(
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    # Get final state
-    state = redis_client.get(f"interview_state:{interview_id}")
+    # Completing twice returns the job queued the first time
+    job = await run_in_threadpool(evaluation_queue.find, interview_id)
+    if job is not None:
+        return _job_payload(job)
     
-    if not state:
+    if not await interview_graph.aget_state(interview_id):
         raise HTTPException(status_code=400, detail="Interview state not found")
     
     # Update interview status
     interview.status = "completed"
     interview.completed_at = datetime.utcnow()
     
+    # The full conversation is only written once, here
+    conversation_history = await session_store.aturns(interview_id)
+    interview.conversation_history = conversation_history
+    
     # Generate transcript
     transcript = "\n\n".join([
         f"{msg['role'].upper()}: {msg['content']}"
-        for msg in state.get("conversation_history", [])
+        for msg in conversation_history
     ])
     interview.transcript = transcript
-    
-    # Generate evaluation
-    evaluation_data = evaluation_service.evaluate_interview(
-        conversation_history=state.get("conversation_history", []),
-        evaluation_notes=state.get("evaluation_notes", []),
-        role=interview.role,
-        user_profile={
-            "skills": current_user.skills or [],
-            "experience_years": current_user.experience_years or 0,
-            "target_roles": current_user.target_roles or []
-        }
-    )
-    
-    # Save evaluation
-    evaluation = Evaluation(
-        user_id=current_user.id,
-        interview_id=interview.id,
-        overall_score=evaluation_data["overall_score"],
-        communication_score=evaluation_data["communication_score"],
-        technical_score=evaluation_data["technical_score"],
-        problem_solving_score=evaluation_data["problem_solving_score"],
-        confidence_score=evaluation_data["confidence_score"],
-        strengths=evaluation_data["strengths"],
-        weaknesses=evaluation_data["weaknesses"],
-        improvement_areas=evaluation_data["improvement_areas"],
-        question_feedback=evaluation_data["question_feedback"],
-        recommendations=evaluation_data["recommendations"]
-    )
-    
-    db.add(evaluation)
     db.commit()
-    db.refresh(evaluation)
     
-    # Clean up Redis
-    redis_client.delete(f"interview_state:{interview_id}")
+    # The evaluation itself runs on a worker (app/worker.py); its inputs must
+    # outlive a queue backlog or retries, not just the interview's own TTL
+    interview_graph.end(interview_id)
+    await run_in_threadpool(interview_graph.retain, interview_id, settings.EVAL_JOB_TTL)
+    llm_service.release_session(str(interview_id))
+    job = await run_in_threadpool(evaluation_queue.enqueue, interview_id, current_user.id)
     
+    return _job_payload(job)
+
+def _job_payload(job: dict) -> dict:
     return {
         "message": "Interview completed",
-        "evaluation_id": evaluation.id,
-        "overall_score": evaluation.overall_score
+        "job_id": job["job_id"],
+        "status": job["status"]
     }
 
-@router.post("/{interview_id}/complete")
+@router.post("/{interview_id}/complete", status_code=202)
 async def complete_interview_endpoint(
     interview_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Manually complete an interview"""
+    """Manually complete an interview; the evaluation is generated in the background"""
     return await complete_interview(interview_id, current_user, db)
 
+@router.get("/evaluation-jobs/{job_id}")
+async def get_evaluation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Status of an evaluation job; carries evaluation_id once completed"""
+    job = await run_in_threadpool(evaluation_queue.get, job_id)
+    
+    if not job or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    
+    return job
+
 @router.delete("/{interview_id}")
 def delete_interview(
     interview_id: int,
@@ -396,7 +437,7 @@ def delete_interview(
     db.commit()
     
     # Clean up Redis
-    redis_client.delete(f"interview_state:{interview_id}")
+    interview_graph.clear(interview_id)
     
     return {"message": "Interview deleted successfully"}
 
@@ -405,11 +446,56 @@ def delete_interview(
 async def websocket_interview(
     websocket: WebSocket,
     interview_id: int,
+    token: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """WebSocket endpoint for real-time interview interaction"""
+    """WebSocket endpoint for real-time voice interviews.
+    
+    Client messages:
+    - {"type": "audio_chunk", "audio": <base64>, "format": "webm"}: part of
+      the answer being recorded; partial transcripts come back meanwhile
+    - {"type": "audio_end"}: the answer is finished; runs the turn
+    - {"type": "audio", "audio": <base64>} or {"type": "text", "text": ...}:
+      a whole answer at once
+    - {"type": "ping"}
+    
+    A turn streams back transcript, token, audio (one per spoken sentence),
+    response or completed, and turn_metrics events.
+    """
+    try:
+        current_user = get_current_user(token=token or "", db=db)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    
+    interview = db.query(Interview).filter(
+        Interview.id == interview_id,
+        Interview.user_id == current_user.id
+    ).first()
+    
+    if not interview:
+        await websocket.close(code=1008)
+        return
+    
     await websocket.accept()
     
+    # Background tasks send too, so every send goes through one lock
+    send_lock = asyncio.Lock()
+    
+    async def send(event: dict):
+        async with send_lock:
+            await websocket.send_json(event)
+    
+    # Pushes the evaluation to the client once its job finishes
+    evaluation_push = None
+    if interview.status == "completed":
+        job = await run_in_threadpool(evaluation_queue.find, interview_id)
+        if job is not None:
+            evaluation_push = asyncio.create_task(_push_evaluation(send, job))
+    
+    transcriber = None
+    partials = set()
+    
     try:
         while True:
             # Receive message from client
@@ -417,48 +503,96 @@ async def websocket_interview(
             
             message_type = data.get("type")
             
-            if message_type == "audio":
-                # Handle audio input
-                audio_data = data.get("audio")
-                
-                # Send thinking indicator
-                await websocket.send_json({
-                    "type": "thinking",
-                    "message": "Processing your response..."
-                })
-                
-                # Process audio (transcribe, generate response, etc.)
-                # ... (implementation similar to respond_to_question)
-                
-                # Send response
-                await websocket.send_json({
-                    "type": "response",
-                    "question": "Next question...",
-                    "audio_url": "/path/to/audio"
-                })
+            if message_type == "audio_chunk":
+                if transcriber is None:
+                    transcriber = IncrementalTranscriber(suffix=f".{data.get('format', 'webm')}")
+                transcriber.feed(base64.b64decode(data.get("audio", "")))
+                if transcriber.should_refresh():
+                    task = asyncio.create_task(_send_partial(transcriber, send))
+                    partials.add(task)
+                    task.add_done_callback(partials.discard)
             
-            elif message_type == "text":
-                # Handle text input
-                text = data.get("text")
+            elif message_type in ("audio_end", "audio", "text"):
+                if message_type == "audio_end" and transcriber is None:
+                    await send({
+                        "type": "error",
+                        "message": "No audio received for this answer"
+                    })
+                    continue
                 
-                await websocket.send_json({
-                    "type": "thinking",
-                    "message": "Analyzing your response..."
-                })
+                db.refresh(interview)
+                if interview.status != "in_progress" or not await interview_graph.aget_state(interview_id):
+                    transcriber = None
+                    await send({
+                        "type": "error",
+                        "message": "Interview is not in progress"
+                    })
+                    continue
                 
-                # Process text
-                # ...
+                # Stage timings of the turn start when the candidate stops speaking
+                started = time.perf_counter()
+                if message_type == "audio_end":
+                    # Partials still running land first, so none arrives after the final transcript
+                    await asyncio.gather(*partials, return_exceptions=True)
+                    user_response = await transcriber.finish()
+                    transcriber = None
+                    if not user_response.strip():
+                        await send({
+                            "type": "error",
+                            "message": "Could not transcribe the answer; please try again"
+                        })
+                        continue
+                elif message_type == "audio":
+                    await send({
+                        "type": "thinking",
+                        "message": "Processing your response..."
+                    })
+                    user_response = await run_in_threadpool(_transcribe_audio, data.get("audio"))
+                else:
+                    user_response = data.get("text", "")
+                stt_ms = (time.perf_counter() - started) * 1000 if message_type != "text" else 0.0
                 
-                await websocket.send_json({
-                    "type": "response",
-                    "question": "Next question..."
-                })
+                if message_type != "text":
+                    await send({"type": "transcript", "text": user_response})
+                
+                # The next question is shown from its first token and spoken from its first sentence
+                async for event in voice_pipeline.run(_stream_turn(interview, user_response, db), started, stt_ms):
+                    await send(event)
+                    if event["type"] == "completed" and evaluation_push is None:
+                        evaluation_push = asyncio.create_task(_push_evaluation(send, event))
             
             elif message_type == "ping":
-                await websocket.send_json({"type": "pong"})
+                await send({"type": "pong"})
     
     except WebSocketDisconnect:
         print(f"WebSocket disconnected for interview {interview_id}")
     except Exception as e:
         print(f"WebSocket error: {e}")
-        await websocket.close()
\ No newline at end of file
+        await websocket.close()
+    finally:
+        for task in partials:
+            task.cancel()
+        if evaluation_push is not None:
+            evaluation_push.cancel()
+
+async def _send_partial(transcriber: IncrementalTranscriber, send):
+    try:
+        text = await transcriber.refresh()
+        if text:
+            await send({"type": "transcript_partial", "text": text})
+    except Exception as e:
+        print(f"Partial transcription failed: {e}")
+
+async def _push_evaluation(send, job: dict):
+    """Send evaluation_ready (or evaluation_failed) when the job finishes"""
+    job = await evaluation_queue.wait(job["job_id"])
+    if job is None:
+        return
+    
+    try:
+        await send({
+            **job,
+            "type": "evaluation_ready" if job["status"] == "completed" else "evaluation_failed"
+        })
+    except Exception as e:
+        print(f"Could not push evaluation for job {job['job_id']}: {e}")
@@ -24,13 +24,95 @@ class Settings(BaseSettings):
     TWILIO_PHONE_NUMBER: str = ""
     
     # LLM
+    LLM_BACKEND: str = "auto"  # auto, remote, local, mock
     MODEL_NAME: str = "mistralai/Mistral-7B-Instruct-v0.2"
     MODEL_CACHE_DIR: str = "./models"
     MAX_NEW_TOKENS: int = 512
     TEMPERATURE: float = 0.7
+    LLM_API_BASE_URL: str = "https://api-inference.huggingface.co"
+    
+    # LLM HTTP connection pool
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY: float = 30.0
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_READ_TIMEOUT: float = 60.0
+    LLM_POOL_TIMEOUT: float = 10.0
+    
+    # LLM remote endpoint resilience
+    LLM_COLD_START_TIMEOUT: float = 120.0
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_MIN_DELAY_MS: float = 500.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    LLM_CIRCUIT_PROBE_TIMEOUT_SECONDS: float = 120.0  # a half-open probe silent this long is replaced
+    LLM_DEGRADED_BACKEND: str = "none"  # none, local, mock
+    LLM_WARM_PING_INTERVAL: float = 0.0  # seconds; 0 disables
+    
+    # LLM scheduler (bounded concurrency with priority classes)
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_RESERVED_INTERACTIVE_SLOTS: int = 2
+    
+    # LLM response cache (in-process LRU in front of Redis)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 86400
+    
+    # LLM request batching (endpoint must accept a list of inputs); flushes of
+    # one prompt are still hedged, multi-prompt batches are not
+    LLM_BATCHING_ENABLED: bool = False
+    LLM_BATCH_MAX_SIZE: int = 8
+    LLM_BATCH_WINDOW_MS: float = 15.0
+    
+    # Local in-process LLM backend (LLM_BACKEND=local)
+    LOCAL_LLM_DEVICE: str = "cpu"
+    LOCAL_LLM_QUANTIZATION: str = "int8"  # int8, int4, none
+    LOCAL_LLM_THREADS: int = 0  # 0 keeps the torch default
+    LOCAL_LLM_KV_CACHE_SESSIONS: int = 16
+    
+    # Interview flow
+    INTERVIEW_BACKGROUND_ANALYSIS: bool = True  # analyze answers off the turn's critical path
+    INTERVIEW_BACKGROUND_SUMMARIES: bool = True  # summarize closed transcript chunks during the interview
+    INTERVIEW_STATE_TTL: int = 3600  # seconds an interview's Redis state outlives its last write
+    INTERVIEW_SPECULATIVE_QUESTIONS: bool = False  # pre-generate the next question while the candidate answers
+    INTERVIEW_SPECULATION_MIN_ANSWER_WORDS: int = 15
+    INTERVIEW_SPECULATION_MAX_OVERLAP: float = 0.3
+    
+    # Pre-generated opening questions per (role, difficulty)
+    QUESTION_BANK_ENABLED: bool = True
+    QUESTION_BANK_POOL_SIZE: int = 30
+    QUESTION_BANK_MIN_POOL: int = 10  # refill in the background below this
+    QUESTION_BANK_BATCH_SIZE: int = 10  # questions per generation call
+    QUESTION_BANK_DEDUP_THRESHOLD: float = 0.9  # cosine similarity
+    QUESTION_BANK_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    
+    # Evaluation prompt budgets (tokens)
+    EVAL_TRANSCRIPT_TOKEN_BUDGET: int = 3072
+    EVAL_DERIVED_INPUT_TOKEN_BUDGET: int = 1024
+    EVAL_SUMMARY_CHUNK_TURNS: int = 4
+    EVAL_SUMMARY_MAX_TOKENS: int = 150
+    EVAL_MAX_CONCURRENCY: int = 4  # parallel action-plan calls per evaluation
+    EVAL_MODE: str = "staged"  # staged (one call per stage) or structured (one JSON call)
+    EVAL_STRUCTURED_MAX_TOKENS: int = 1200
+    EVAL_SCORE_WEIGHTING: str = "uniform"  # uniform or recency, for per-answer scores
+    
+    # Semantic cache of action plans per weakness, shared across users
+    ACTION_PLAN_CACHE_ENABLED: bool = True
+    ACTION_PLAN_CACHE_MAX_ENTRIES: int = 256  # per role
+    ACTION_PLAN_CACHE_THRESHOLD: float = 0.85  # cosine similarity
+    ACTION_PLAN_CACHE_POLICY: str = "lru"  # lru or lfu
+    ACTION_PLAN_CACHE_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    
+    # Evaluation job queue (workers: python -m app.worker)
+    EVAL_WORKER_CONCURRENCY: int = 2
+    EVAL_JOB_MAX_ATTEMPTS: int = 3
+    EVAL_JOB_LEASE_SECONDS: int = 120  # a job is retried if its worker stops renewing this
+    EVAL_JOB_TTL: int = 86400
+    EVAL_JOB_NOTES_WAIT_SECONDS: int = 60
     
     # STT
     WHISPER_MODEL: str = "base"
+    STT_PARTIAL_INTERVAL_MS: int = 1000  # partial transcripts while audio streams in
     
     # TTS
     TTS_MODEL: str = "tts_models/en/ljspeech/tacotron2-DDC"
@@ -5,6 +5,10 @@ from fastapi.responses import JSONResponse
 from app.config import get_settings
 from app.utils.database import init_db
 from app.api import auth, users, interviews, analytics
+from app.services.llm_cache import llm_cache
+from app.services.llm_metrics import llm_metrics
+from app.services.llm_scheduler import llm_scheduler
+import asyncio
 import os
 import logging
 
@@ -73,6 +77,7 @@ async def startup_event():
     # Load ML models
     try:
         from app.services.llm_service import llm_service
+        llm_service.start_background_tasks()
         logger.info("LLM service initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize LLM service: {e}")
@@ -95,6 +100,13 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Interview Practice Partner API...")
+    
+    # Close pooled LLM connections
+    try:
+        from app.services.llm_service import llm_service
+        await llm_service.aclose()
+    except Exception as e:
+        logger.error(f"Failed to close LLM service: {e}")
 
 # Health check endpoint
 @app.get("/health")
@@ -105,6 +117,42 @@ async def health_check():
         "app": settings.APP_NAME
     }
 
+# Metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    """LLM latency/token metrics per call site, plus cache, scheduler, evaluation worker, voice turn, speculation and question bank stats"""
+    from app.services.llm_service import llm_service, llm_loop
+    
+    # Cache and scheduler state is owned by the LLM I/O loop; read it there
+    async def collect():
+        return {
+            "backend": llm_service.stats(),
+            "cache": llm_cache.stats(),
+            "scheduler": llm_scheduler.stats()
+        }
+    
+    data = await llm_loop.run_async(collect())
+    data["call_sites"] = llm_metrics.snapshot()
+    
+    # Evaluation stages, their LLM calls and the action plan cache run in the
+    # workers; these stats are read from Redis, off the event loop
+    from app.services.evaluation_queue import evaluation_queue
+    data["evaluation_queue"], data["evaluation_workers"] = await asyncio.gather(
+        asyncio.to_thread(evaluation_queue.stats),
+        asyncio.to_thread(evaluation_queue.worker_stats)
+    )
+    
+    from app.services.voice_pipeline import voice_metrics
+    data["voice_turns"] = voice_metrics.stats()
+    
+    from app.agents.interview_graph import interview_graph
+    if interview_graph.speculator is not None:
+        data["speculation"] = interview_graph.speculator.stats()
+    if interview_graph.use_question_bank:
+        from app.services.question_bank import question_bank
+        data["question_bank"] = await asyncio.to_thread(question_bank.stats)
+    return data
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -0,0 +1,146 @@
+import asyncio
+import re
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from app.config import get_settings
+from app.utils.embeddings import get_encoder
+
+settings = get_settings()
+
+
+def normalize_weakness(text: str) -> str:
+    """Lowercase, drop punctuation and list markers, collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+class _RoleIndex:
+    """Fixed-capacity store of one role's cached plans.
+
+    Embeddings sit in one preallocated (capacity x dim) matrix, so a lookup
+    is a single matrix-vector product. When full, the least recently used
+    (lru) or least used (lfu) slot is overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.vectors: Optional[np.ndarray] = None
+        self.keys: List[str] = []
+        self.plans: List[str] = []
+        self.last_used = np.zeros(capacity)
+        self.uses = np.zeros(capacity)
+
+    def find(self, key: str, vector: Optional[np.ndarray], threshold: float) -> Optional[int]:
+        if key in self.keys:
+            return self.keys.index(key)
+        if vector is None or self.vectors is None or not self.keys:
+            return None
+        similarities = self.vectors[:len(self.keys)] @ vector
+        best = int(np.argmax(similarities))
+        return best if similarities[best] >= threshold else None
+
+    def touch(self, slot: int, clock: int):
+        self.last_used[slot] = clock
+        self.uses[slot] += 1
+
+    def add(self, key: str, vector: Optional[np.ndarray], plan: str, clock: int, policy: str) -> bool:
+        """Store a plan; returns True if another entry was evicted for it"""
+        evicted = len(self.keys) >= self.capacity
+        if evicted:
+            size = len(self.keys)
+            slot = int(np.argmin(self.uses[:size] if policy == "lfu" else self.last_used[:size]))
+            self.keys[slot] = key
+            self.plans[slot] = plan
+        else:
+            slot = len(self.keys)
+            self.keys.append(key)
+            self.plans.append(plan)
+
+        if vector is not None:
+            if self.vectors is None:
+                self.vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self.vectors[slot] = vector
+        self.uses[slot] = 0
+        self.touch(slot, clock)
+        return evicted
+
+
+class ActionPlanCache:
+    """Semantic cache of improvement-area action plans, shared across users.
+
+    Weaknesses repeat a lot between candidates ("lack of concrete examples",
+    "limited system design depth"), so a plan generated for one is reused
+    for any later weakness in the same role whose sentence embedding is
+    within `threshold` cosine similarity. Without sentence-transformers only
+    identical normalized weaknesses match. Each role holds at most
+    `max_entries` plans in this process.
+    """
+
+    def __init__(self, max_entries: int = None, threshold: float = None, policy: str = None):
+        self.max_entries = max_entries or settings.ACTION_PLAN_CACHE_MAX_ENTRIES
+        self.threshold = threshold or settings.ACTION_PLAN_CACHE_THRESHOLD
+        self.policy = policy or settings.ACTION_PLAN_CACHE_POLICY
+        self._indexes: Dict[str, _RoleIndex] = {}
+        self._lock = threading.Lock()
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, role: str, weakness: str) -> Optional[str]:
+        """A cached plan for a similar weakness in this role, if any"""
+        key = normalize_weakness(weakness)
+        vector = self._embed(key)
+        with self._lock:
+            index = self._indexes.get(role)
+            slot = index.find(key, vector, self.threshold) if index is not None else None
+            if slot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._clock += 1
+            index.touch(slot, self._clock)
+            return index.plans[slot]
+
+    def store(self, role: str, weakness: str, plan: str):
+        if not plan or not plan.strip():
+            return
+        key = normalize_weakness(weakness)
+        vector = self._embed(key)
+        with self._lock:
+            index = self._indexes.setdefault(role, _RoleIndex(self.max_entries))
+            if index.find(key, vector, self.threshold) is not None:
+                return
+            self._clock += 1
+            if index.add(key, vector, plan, self._clock, self.policy):
+                self.evictions += 1
+
+    async def alookup(self, role: str, weakness: str) -> Optional[str]:
+        return await asyncio.to_thread(self.lookup, role, weakness)
+
+    async def astore(self, role: str, weakness: str, plan: str):
+        await asyncio.to_thread(self.store, role, weakness, plan)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = {role: len(index.keys) for role, index in self._indexes.items()}
+        return {
+            "entries": sum(entries.values()),
+            "roles": len(entries),
+            "max_entries_per_role": self.max_entries,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        encoder = get_encoder(settings.ACTION_PLAN_CACHE_EMBEDDING_MODEL)
+        if encoder is None:
+            return None
+        return np.asarray(encoder.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+
+action_plan_cache = ActionPlanCache()
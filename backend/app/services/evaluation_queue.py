@@ -0,0 +1,186 @@
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+from app.config import get_settings
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+FINISHED = ("completed", "failed")
+
+class EvaluationQueue:
+    """Durable Redis queue of interview evaluations.
+
+    The API enqueues a job when an interview ends and returns at once;
+    worker processes (`python -m app.worker`) claim jobs with BLMOVE into a
+    processing list and hold a lease on each one while they run it. A job
+    whose lease expires, because its worker died, is put back in the queue
+    by any other worker. Failed jobs are retried up to `max_attempts`
+    times. There is at most one job per interview, so enqueueing again
+    returns the existing job.
+    """
+
+    def __init__(self, max_attempts: int = None, lease_seconds: int = None, ttl: int = None):
+        self.max_attempts = max_attempts or settings.EVAL_JOB_MAX_ATTEMPTS
+        self.lease_seconds = lease_seconds or settings.EVAL_JOB_LEASE_SECONDS
+        self.ttl = ttl or settings.EVAL_JOB_TTL
+        self.pending_key = "evaluation_jobs:pending"
+        self.processing_key = "evaluation_jobs:processing"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"evaluation_job:{job_id}"
+
+    def _lease_key(self, job_id: str) -> str:
+        return f"evaluation_job_lease:{job_id}"
+
+    def _interview_key(self, interview_id: int) -> str:
+        return f"evaluation_job_for:{interview_id}"
+
+    def enqueue(self, interview_id: int, user_id: int) -> Dict:
+        """Queue an evaluation, or return the job already queued for this interview"""
+        existing = self.find(interview_id)
+        if existing is not None:
+            return existing
+
+        job_id = uuid.uuid4().hex
+        # Only the first caller for an interview gets to create its job
+        if not redis_client.client.set(self._interview_key(interview_id), job_id, nx=True, ex=self.ttl):
+            return self.find(interview_id)
+
+        now = datetime.utcnow().isoformat()
+        job = {
+            "job_id": job_id,
+            "interview_id": interview_id,
+            "user_id": user_id,
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now
+        }
+        pipe = redis_client.client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping=job)
+        pipe.expire(self._job_key(job_id), self.ttl)
+        pipe.rpush(self.pending_key, job_id)
+        pipe.execute()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = redis_client.client.hgetall(self._job_key(job_id))
+        if not job:
+            return None
+        for field in ("interview_id", "user_id", "attempts", "evaluation_id"):
+            if field in job:
+                job[field] = int(job[field])
+        if "overall_score" in job:
+            job["overall_score"] = float(job["overall_score"])
+        job.pop("claimed_at", None)
+        return job
+
+    def find(self, interview_id: int) -> Optional[Dict]:
+        """The evaluation job of an interview, if any"""
+        job_id = redis_client.client.get(self._interview_key(interview_id))
+        return self.get(job_id) if job_id else None
+
+    async def wait(self, job_id: str, timeout: float = None, interval: float = 1.0) -> Optional[Dict]:
+        """Poll until the job finishes; returns it, or None on timeout"""
+        deadline = time.monotonic() + (timeout or self.lease_seconds * self.max_attempts)
+        while time.monotonic() < deadline:
+            job = await asyncio.to_thread(self.get, job_id)
+            if job is None or job["status"] in FINISHED:
+                return job
+            await asyncio.sleep(interval)
+        return None
+
+    # Worker side
+
+    def claim(self, timeout: float = 5.0) -> Optional[str]:
+        """Take the next job, waiting up to `timeout` seconds for one"""
+        job_id = redis_client.client.blmove(self.pending_key, self.processing_key, timeout, "LEFT", "RIGHT")
+        if job_id is None:
+            return None
+
+        pipe = redis_client.client.pipeline()
+        pipe.set(self._lease_key(job_id), 1, ex=self.lease_seconds)
+        pipe.hset(self._job_key(job_id), mapping={
+            "status": "running",
+            "claimed_at": time.time(),
+            "updated_at": datetime.utcnow().isoformat()
+        })
+        pipe.hincrby(self._job_key(job_id), "attempts", 1)
+        pipe.execute()
+        return job_id
+
+    def heartbeat(self, job_id: str):
+        """Extend the lease of a job that is still running"""
+        redis_client.client.expire(self._lease_key(job_id), self.lease_seconds)
+
+    def complete(self, job_id: str, result: Dict):
+        pipe = redis_client.client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={
+            **result,
+            "status": "completed",
+            "updated_at": datetime.utcnow().isoformat()
+        })
+        pipe.hdel(self._job_key(job_id), "error")
+        pipe.lrem(self.processing_key, 1, job_id)
+        pipe.delete(self._lease_key(job_id))
+        pipe.execute()
+
+    def fail(self, job_id: str, error: str):
+        """Retry the job, or mark it failed once it is out of attempts"""
+        # Whoever removes the job from the processing list decides what happens to it
+        if not redis_client.client.lrem(self.processing_key, 1, job_id):
+            return
+
+        attempts = int(redis_client.client.hget(self._job_key(job_id), "attempts") or 0)
+        retry = attempts < self.max_attempts
+        pipe = redis_client.client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={
+            "status": "queued" if retry else "failed",
+            "error": error,
+            "updated_at": datetime.utcnow().isoformat()
+        })
+        pipe.delete(self._lease_key(job_id))
+        if retry:
+            pipe.rpush(self.pending_key, job_id)
+        pipe.execute()
+
+    def drop(self, job_id: str):
+        """Remove a job whose record has expired from the processing list"""
+        redis_client.client.lrem(self.processing_key, 1, job_id)
+        redis_client.client.delete(self._lease_key(job_id))
+
+    def requeue_expired(self) -> int:
+        """Retry jobs whose worker stopped renewing the lease; returns how many"""
+        requeued = 0
+        for job_id in redis_client.client.lrange(self.processing_key, 0, -1):
+            if redis_client.client.exists(self._lease_key(job_id)):
+                continue
+            # Skip jobs claimed a moment ago whose lease is not written yet
+            claimed_at = float(redis_client.client.hget(self._job_key(job_id), "claimed_at") or 0)
+            if time.time() - claimed_at < self.lease_seconds:
+                continue
+            self.fail(job_id, "Worker stopped before finishing the job")
+            requeued += 1
+        return requeued
+
+    def publish_worker_stats(self, worker_id: str, stats: Dict, ttl: int = 30):
+        """Stats of one worker process, kept only while it keeps publishing"""
+        redis_client.client.set(f"evaluation_worker_stats:{worker_id}", json.dumps(stats), ex=ttl)
+
+    def worker_stats(self) -> Dict[str, Dict]:
+        prefix = "evaluation_worker_stats:"
+        keys = list(redis_client.client.scan_iter(match=f"{prefix}*"))
+        values = redis_client.client.mget(keys) if keys else []
+        return {key[len(prefix):]: json.loads(value) for key, value in zip(keys, values) if value}
+
+    def stats(self) -> Dict:
+        return {
+            "pending": redis_client.client.llen(self.pending_key),
+            "processing": redis_client.client.llen(self.processing_key)
+        }
+
+evaluation_queue = EvaluationQueue()
@@ -1,51 +1,113 @@
-from typing import Dict, List
-from app.services.llm_service import llm_service
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Dict, List, Tuple
+from app.config import get_settings
+from app.services.action_plan_cache import action_plan_cache
+from app.services.llm_scheduler import Priority
+from app.services.llm_service import llm_loop, llm_service
+from app.services.structured_evaluation import structured_evaluator
+from app.services.transcript_compactor import transcript_compactor
+from app.services.turn_scoring import SCORE_DIMENSIONS, aggregate_turn_scores
+from app.utils.tokens import truncate_to_tokens
 import numpy as np
 
+settings = get_settings()
+
+# Stage name -> (stages it depends on, coroutine taking their results in order)
+Stages = Dict[str, Tuple[List[str], Callable[..., Awaitable]]]
+
 class EvaluationService:
-    def __init__(self):
+    """Final interview evaluation, run as a dependency graph of LLM stages.
+
+    Scores and strengths/weaknesses only need the overall evaluation, and
+    recommendations only need the scores and the weakness names, so they run
+    concurrently with the per-weakness action plans, which are themselves
+    fanned out up to `EVAL_MAX_CONCURRENCY` at a time. Each stage's wall
+    time is returned with the report and aggregated in `stats`.
+    
+    With `mode="structured"` the report instead comes from a single JSON
+    call validated against a schema (see `StructuredEvaluator`).
+    
+    In both modes the numeric scores are a weighted mean of the scores each
+    answer got when it was analyzed (see `aggregate_turn_scores`), so only
+    the narrative parts are generated at the end.
+    """
+    
+    def __init__(self, max_concurrency: int = None, mode: str = None, priority: Priority = Priority.EVALUATION):
         self.scoring_criteria = {
             "communication": ["clarity", "articulation", "structure"],
             "technical": ["accuracy", "depth", "examples"],
             "problem_solving": ["approach", "creativity", "logic"],
             "confidence": ["assertiveness", "composure", "engagement"]
         }
+        self.max_concurrency = max_concurrency or settings.EVAL_MAX_CONCURRENCY
+        self.mode = mode or settings.EVAL_MODE
+        # Scheduler class of every call made for an evaluation
+        self.priority = priority
+        self._stage_timings: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self._lock = threading.Lock()
     
     def evaluate_interview(
         self,
         conversation_history: List[Dict],
         evaluation_notes: List[Dict],
         role: str,
-        user_profile: Dict
+        user_profile: Dict,
+        transcript_summaries: Dict[str, str] = None
     ) -> Dict:
-        """Generate comprehensive evaluation"""
-        
-        # Generate overall evaluation
-        overall_eval = self._generate_overall_evaluation(
+        """Blocking wrapper around `aevaluate_interview` for sync callers"""
+        return llm_loop.run(self.aevaluate_interview(
             conversation_history,
             evaluation_notes,
-            role
-        )
+            role,
+            user_profile,
+            transcript_summaries
+        ))
+    
+    async def aevaluate_interview(
+        self,
+        conversation_history: List[Dict],
+        evaluation_notes: List[Dict],
+        role: str,
+        user_profile: Dict,
+        transcript_summaries: Dict[str, str] = None
+    ) -> Dict:
+        """Generate comprehensive evaluation.
+
+        `transcript_summaries` is the session's cache of older-turn summaries
+        (see `asummarize_transcript`); new ones are added to it in place.
+        """
+        if self.mode == "structured":
+            return await self._evaluate_structured(conversation_history, evaluation_notes, role, transcript_summaries)
         
-        # Calculate scores
-        scores = self._calculate_scores(evaluation_notes, overall_eval)
+        # Bounds the action-plan fan-out of this evaluation
+        limit = asyncio.Semaphore(self.max_concurrency)
         
-        # Identify strengths and weaknesses
-        strengths, weaknesses = self._identify_strengths_weaknesses(overall_eval)
+        # Scores come from the per-answer scores when every dimension has some;
+        # only older notes without them need the LLM scoring stage
+        turn_scores = aggregate_turn_scores(evaluation_notes)
+        if turn_scores is not None:
+            scores_stage = ([], lambda: self._turn_scores(turn_scores))
+        else:
+            scores_stage = (["overall"], lambda overall_eval: self._calculate_scores(evaluation_notes, overall_eval))
         
-        # Generate improvement areas
-        improvement_areas = self._generate_improvement_areas(
-            weaknesses,
-            role,
-            user_profile
-        )
+        async def recommendations(scores, strengths_weaknesses):
+            # Only the weakness names feed the prompt, not their action plans
+            areas = [{"area": weakness} for weakness in strengths_weaknesses[1]]
+            return await self._generate_recommendations(scores, areas, role)
         
-        # Generate recommendations
-        recommendations = self._generate_recommendations(
-            scores,
-            improvement_areas,
-            role
-        )
+        results, timings = await self._run_stages({
+            "overall": ([], lambda: self._generate_overall_evaluation(conversation_history, evaluation_notes, role, transcript_summaries)),
+            "scores": scores_stage,
+            "strengths_weaknesses": (["overall"], self._identify_strengths_weaknesses),
+            "improvement_areas": (["strengths_weaknesses"], lambda sw: self._generate_improvement_areas(sw[1], role, user_profile, limit)),
+            "recommendations": (["scores", "strengths_weaknesses"], recommendations)
+        })
+        
+        scores = results["scores"]
+        strengths, weaknesses = results["strengths_weaknesses"]
         
         return {
             "overall_score": scores["overall"],
@@ -55,27 +117,117 @@ class EvaluationService:
             "confidence_score": scores["confidence"],
             "strengths": strengths,
             "weaknesses": weaknesses,
-            "improvement_areas": improvement_areas,
-            "recommendations": recommendations,
-            "question_feedback": evaluation_notes
+            "improvement_areas": results["improvement_areas"],
+            "recommendations": results["recommendations"],
+            "question_feedback": evaluation_notes,
+            "stage_timings_ms": timings
         }
     
-    def _generate_overall_evaluation(
+    async def _evaluate_structured(
         self,
         conversation_history: List[Dict],
         evaluation_notes: List[Dict],
-        role: str
+        role: str,
+        transcript_summaries: Dict[str, str] = None
+    ) -> Dict:
+        """Single-pass evaluation.
+
+        Fields the model could not produce are left empty, except scores: a
+        missing sub-score would drop out of the report and skew the overall
+        score, so those come from the staged scoring stages instead.
+        """
+        results, timings = await self._run_stages({
+            "inputs": ([], lambda: self._compact_inputs(conversation_history, evaluation_notes, transcript_summaries)),
+            "structured": (["inputs"], lambda inputs: structured_evaluator.aevaluate(*inputs, role, self.priority))
+        })
+        fields, report = results["structured"]
+        
+        scores = aggregate_turn_scores(evaluation_notes) or {
+            name: fields.get(f"{name}_score")
+            for name in SCORE_DIMENSIONS
+        }
+        scores.pop("overall", None)
+        missing = [name for name, score in scores.items() if score is None]
+        if missing:
+            fallback, fallback_timings = await self._run_stages({
+                "fallback_overall": ([], lambda: self._generate_overall_evaluation(conversation_history, evaluation_notes, role, transcript_summaries)),
+                "fallback_scores": (["fallback_overall"], lambda overall_eval: self._calculate_scores(evaluation_notes, overall_eval))
+            })
+            scores.update({name: fallback["fallback_scores"][name] for name in missing})
+            timings.update(fallback_timings)
+        
+        return {
+            "overall_score": float(np.mean(list(scores.values()))),
+            **{f"{name}_score": score for name, score in scores.items()},
+            "strengths": fields.get("strengths", []),
+            "weaknesses": fields.get("weaknesses", []),
+            "improvement_areas": fields.get("improvement_areas", []),
+            "recommendations": fields.get("recommendations", ""),
+            "question_feedback": evaluation_notes,
+            "stage_timings_ms": timings,
+            "fallback_score_fields": missing,
+            **report
+        }
+    
+    async def _run_stages(self, stages: Stages) -> Tuple[Dict, Dict[str, float]]:
+        """Run every stage as soon as its dependencies are done; returns results and wall times"""
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, float] = {}
+        
+        async def run(name: str):
+            deps, stage = stages[name]
+            inputs = [await tasks[dep] for dep in deps]
+            started = time.perf_counter()
+            result = await stage(*inputs)
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+            return result
+        
+        # Every task exists before any of them first awaits a dependency
+        for name in stages:
+            tasks[name] = asyncio.ensure_future(run(name))
+        try:
+            values = await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        
+        with self._lock:
+            for name, ms in timings.items():
+                self._stage_timings[name].append(ms)
+        return dict(zip(stages, values)), timings
+    
+    def stats(self) -> Dict:
+        """Recent wall time per evaluation stage"""
+        with self._lock:
+            timings = {name: sorted(values) for name, values in self._stage_timings.items()}
+        return {
+            name: {
+                "count": len(values),
+                "avg_ms": round(sum(values) / len(values), 1),
+                "p50_ms": values[int(0.50 * (len(values) - 1))],
+                "p95_ms": values[int(0.95 * (len(values) - 1))]
+            }
+            for name, values in timings.items() if values
+        }
+    
+    async def _generate_overall_evaluation(
+        self,
+        conversation_history: List[Dict],
+        evaluation_notes: List[Dict],
+        role: str,
+        transcript_summaries: Dict[str, str] = None
     ) -> str:
         """Generate comprehensive evaluation using LLM"""
+        transcript, evaluations = await self._compact_inputs(conversation_history, evaluation_notes, transcript_summaries)
         
         eval_prompt = f"""
 Provide a comprehensive evaluation of this interview for a {role} position.
 
 Interview Transcript:
-{self._format_conversation(conversation_history)}
+{transcript}
 
 Question-by-question evaluations:
-{self._format_evaluations(evaluation_notes)}
+{evaluations}
 
 Provide a detailed evaluation covering:
 1. Overall performance
@@ -89,16 +241,65 @@ Provide a detailed evaluation covering:
 Evaluation:
 """
         
-        evaluation = llm_service.generate(
+        evaluation = await llm_service.agenerate(
             prompt=eval_prompt,
             system_prompt="You are an expert interview evaluator providing detailed, constructive feedback.",
             max_new_tokens=800,
-            temperature=0.7
+            temperature=0.7,
+            priority=self.priority,
+            call_site="_generate_overall_evaluation"
         )
         
         return evaluation
     
-    def _calculate_scores(
+    async def asummarize_transcript(
+        self,
+        conversation_history: List[Dict],
+        evaluation_notes: List[Dict],
+        transcript_summaries: Dict[str, str]
+    ):
+        """Add the chunk summaries the evaluation prompt would need so far to `transcript_summaries`.
+
+        Chunk boundaries are fixed from the start of the interview, so
+        summaries made while it runs are reused by the final evaluation.
+        """
+        await self._compact_inputs(conversation_history, evaluation_notes, transcript_summaries)
+    
+    async def _compact_inputs(
+        self,
+        conversation_history: List[Dict],
+        evaluation_notes: List[Dict],
+        transcript_summaries: Dict[str, str] = None
+    ) -> Tuple[str, str]:
+        """Transcript and per-question notes, fitted into the evaluation token budget"""
+        
+        # Split the budget between the raw transcript and the per-question notes
+        if transcript_summaries is None:
+            transcript_summaries = {}
+        budget = settings.EVAL_TRANSCRIPT_TOKEN_BUDGET
+        transcript, evaluations = await asyncio.gather(
+            transcript_compactor.acompact(
+                "messages",
+                self._conversation_entries(conversation_history),
+                int(budget * 0.4),
+                transcript_summaries,
+                self.priority
+            ),
+            transcript_compactor.acompact(
+                "questions",
+                self._evaluation_entries(evaluation_notes),
+                int(budget * 0.6),
+                transcript_summaries,
+                self.priority
+            )
+        )
+        return transcript, evaluations
+    
+    async def _turn_scores(self, scores: Dict[str, float]) -> Dict[str, float]:
+        """Scores aggregated from the per-answer scores; no LLM call"""
+        return scores
+    
+    async def _calculate_scores(
         self,
         evaluation_notes: List[Dict],
         overall_eval: str
@@ -114,7 +315,7 @@ Based on this evaluation, provide numerical scores (0-100) for:
 4. Confidence
 
 Evaluation:
-{overall_eval}
+{truncate_to_tokens(overall_eval, settings.EVAL_DERIVED_INPUT_TOKEN_BUDGET)}
 
 Provide scores in this exact format:
 Communication: [score]
@@ -123,10 +324,13 @@ Problem Solving: [score]
 Confidence: [score]
 """
         
-        scores_text = llm_service.generate(
+        scores_text = await llm_service.agenerate(
             prompt=scoring_prompt,
             max_new_tokens=100,
-            temperature=0.3
+            temperature=0.3,
+            cache=True,
+            priority=self.priority,
+            call_site="_calculate_scores"
         )
         
         # Parse scores
@@ -163,7 +367,7 @@ Confidence: [score]
         
         return scores
     
-    def _identify_strengths_weaknesses(
+    async def _identify_strengths_weaknesses(
         self,
         evaluation: str
     ) -> tuple[List[str], List[str]]:
@@ -175,7 +379,7 @@ From this evaluation, extract:
 2. Top 3-5 weaknesses/areas for improvement
 
 Evaluation:
-{evaluation}
+{truncate_to_tokens(evaluation, settings.EVAL_DERIVED_INPUT_TOKEN_BUDGET)}
 
 Format:
 STRENGTHS:
@@ -189,10 +393,12 @@ WEAKNESSES:
 ...
 """
         
-        result = llm_service.generate(
+        result = await llm_service.agenerate(
             prompt=extraction_prompt,
             max_new_tokens=300,
-            temperature=0.5
+            temperature=0.5,
+            priority=self.priority,
+            call_site="_identify_strengths_weaknesses"
         )
         
         strengths = []
@@ -209,17 +415,16 @@ WEAKNESSES:
         
         return strengths[:5], weaknesses[:5]
     
-    def _generate_improvement_areas(
+    async def _generate_improvement_areas(
         self,
         weaknesses: List[str],
         role: str,
-        user_profile: Dict
+        user_profile: Dict,
+        limit: asyncio.Semaphore
     ) -> List[Dict]:
-        """Generate specific improvement areas with action items"""
+        """Generate specific improvement areas with action items, one call per uncached weakness in parallel"""
         
-        improvement_areas = []
-        
-        for weakness in weaknesses:
+        async def improvement_area(weakness: str) -> Dict:
             action_prompt = f"""
 For this weakness in a {role} interview:
 "{weakness}"
@@ -232,21 +437,29 @@ Provide:
 Keep it practical and actionable:
 """
             
-            actions = llm_service.generate(
-                prompt=action_prompt,
-                max_new_tokens=200,
-                temperature=0.7
-            )
+            actions = await action_plan_cache.alookup(role, weakness) if settings.ACTION_PLAN_CACHE_ENABLED else None
+            if actions is None:
+                async with limit:
+                    actions = await llm_service.agenerate(
+                        prompt=action_prompt,
+                        max_new_tokens=200,
+                        temperature=0.7,
+                        priority=self.priority,
+                        call_site="_generate_improvement_areas"
+                    )
+                # An empty plan means the backend failed; caching it would serve it to every later candidate
+                if settings.ACTION_PLAN_CACHE_ENABLED and actions.strip():
+                    await action_plan_cache.astore(role, weakness, actions)
             
-            improvement_areas.append({
+            return {
                 "area": weakness,
                 "action_plan": actions,
                 "priority": "high" if "technical" in weakness.lower() else "medium"
-            })
+            }
         
-        return improvement_areas
+        return list(await asyncio.gather(*[improvement_area(weakness) for weakness in weaknesses]))
     
-    def _generate_recommendations(
+    async def _generate_recommendations(
         self,
         scores: Dict[str, float],
         improvement_areas: List[Dict],
@@ -274,31 +487,34 @@ Provide:
 Recommendations:
 """
         
-        recommendations = llm_service.generate(
+        recommendations = await llm_service.agenerate(
             prompt=rec_prompt,
             max_new_tokens=500,
-            temperature=0.7
+            temperature=0.7,
+            priority=self.priority,
+            call_site="_generate_recommendations"
         )
         
         return recommendations
     
     def _format_conversation(self, history: List[Dict]) -> str:
         """Format conversation history"""
-        formatted = []
-        for msg in history:
-            role = msg["role"].capitalize()
-            content = msg["content"]
-            formatted.append(f"{role}: {content}")
-        return "\n".join(formatted)
+        return "\n".join(self._conversation_entries(history))
     
     def _format_evaluations(self, notes: List[Dict]) -> str:
         """Format evaluation notes"""
-        formatted = []
-        for i, note in enumerate(notes, 1):
-            formatted.append(f"Q{i}: {note['question']}")
-            formatted.append(f"A{i}: {note['response']}")
-            formatted.append(f"Evaluation: {note['evaluation']}\n")
-        return "\n".join(formatted)
+        return "\n".join(self._evaluation_entries(notes))
+    
+    def _conversation_entries(self, history: List[Dict]) -> List[str]:
+        """One transcript line per message"""
+        return [f"{msg['role'].capitalize()}: {msg['content']}" for msg in history]
+    
+    def _evaluation_entries(self, notes: List[Dict]) -> List[str]:
+        """One Q/A/evaluation block per question"""
+        return [
+            f"Q{i}: {note['question']}\nA{i}: {note['response']}\nEvaluation: {note['evaluation']}\n"
+            for i, note in enumerate(notes, 1)
+        ]
     
     def _format_improvement_areas(self, areas: List[Dict]) -> str:
         """Format improvement areas"""
@@ -0,0 +1,92 @@
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict, List, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+
+SendBatch = Callable[[List[str], Dict], Awaitable[List[str]]]
+
+
+class LLMRequestBatcher:
+    """Coalesce concurrent generate calls into batched inference requests.
+
+    Requests with identical generation parameters share a queue. A queue is
+    flushed as one request when it reaches `max_batch_size` or when its oldest
+    request has waited `window_ms`, and each caller gets its own completion
+    back. Must only be used from the LLM I/O loop.
+    """
+
+    def __init__(self, send_batch: SendBatch, max_batch_size: int = None, window_ms: float = None):
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size or settings.LLM_BATCH_MAX_SIZE
+        self.window_ms = window_ms if window_ms is not None else settings.LLM_BATCH_WINDOW_MS
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._params: Dict[str, Dict] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._in_flight = set()
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    async def submit(self, prompt: str, params: Dict) -> str:
+        """Queue a prompt and wait for its completion"""
+        loop = asyncio.get_running_loop()
+        key = json.dumps(params, sort_keys=True)
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(key, [])
+        self._params[key] = params
+        batch.append((prompt, future))
+        self.requests += 1
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.window_ms / 1000, self._flush, key)
+
+        return await future
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "queued": sum(len(batch) for batch in self._pending.values())
+        }
+
+    def _flush(self, key: str):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, [])
+        params = self._params.pop(key, {})
+        if not batch:
+            return
+
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        task = asyncio.ensure_future(self._send(batch, params))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]], params: Dict):
+        prompts = [prompt for prompt, _ in batch]
+        try:
+            results = await self.send_batch(prompts, params)
+            if len(results) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} batch results, got {len(results)}")
+        except Exception as e:
+            # Each caller reports the failure through its own error handling
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), text in zip(batch, results):
+            # Callers may have given up (cancelled) while the batch was in flight
+            if not future.done():
+                future.set_result(text)
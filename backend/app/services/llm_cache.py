@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.config import get_settings
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+
+class LLMResponseCache:
+    """Two-tier cache for repeatable LLM calls.
+
+    An in-process LRU sits in front of Redis. Entries expire after a TTL in
+    both tiers and the LRU is bounded by entry count. The cache is only used
+    from the LLM I/O loop, so the LRU needs no locking.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: int = None, prefix: str = "llm_cache:"):
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.LLM_CACHE_TTL_SECONDS
+        self.prefix = prefix
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = {"memory": 0, "redis": 0}
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, model: str, prompt: str, system_prompt: Optional[str], params: Dict) -> str:
+        """Hash everything that can change the completion"""
+        raw = json.dumps({
+            "model": model,
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "params": params
+        }, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Look up a completion in memory, then in Redis"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits["memory"] += 1
+                return value
+            del self._entries[key]
+
+        value = await self._redis_call(redis_client.get, self.prefix + key)
+        if value is not None:
+            self.hits["redis"] += 1
+            self._store_local(key, value, self.ttl)
+            return value
+
+        self.misses += 1
+        return None
+
+    async def aset(self, key: str, value: str, ttl: int = None):
+        """Store a completion in both tiers"""
+        ttl = ttl or self.ttl
+        self._store_local(key, value, ttl)
+        await self._redis_call(redis_client.set, self.prefix + key, value, expire=ttl)
+
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire on their own)"""
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits["memory"] + self.hits["redis"] + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_hits": self.hits["memory"],
+            "redis_hits": self.hits["redis"],
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0
+        }
+
+    def _store_local(self, key: str, value: str, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _redis_call(self, fn, *args, **kwargs):
+        # Redis is an optimisation here; an outage must not fail generation
+        try:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        except Exception as e:
+            print(f"LLM cache Redis error: {e}")
+            return None
+
+
+llm_cache = LLMResponseCache()
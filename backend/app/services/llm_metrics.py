@@ -0,0 +1,94 @@
+import threading
+from collections import defaultdict, deque
+from typing import Dict
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class CallSiteMetrics:
+    """Counters and a latency histogram for one LLM call site"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.empty_responses = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_total_ms = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent_latencies_ms = deque(maxlen=1000)
+
+    def observe(self, latency_ms: float, prompt_tokens: int, completion_tokens: int, error: bool, empty: bool, cache_hit: bool):
+        self.calls += 1
+        self.errors += int(error)
+        self.empty_responses += int(empty)
+        self.cache_hits += int(cache_hit)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.latency_total_ms += latency_ms
+        self.recent_latencies_ms.append(latency_ms)
+
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+
+    def snapshot(self) -> Dict:
+        latencies = sorted(self.recent_latencies_ms)
+
+        def percentile(q: float) -> float:
+            return round(latencies[int(q * (len(latencies) - 1))], 2) if latencies else 0.0
+
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / calls, 4),
+            "empty_responses": self.empty_responses,
+            "empty_rate": round(self.empty_responses / calls, 4),
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": round(self.cache_hits / calls, 4),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / calls, 1),
+            "avg_completion_tokens": round(self.completion_tokens / calls, 1),
+            "latency_ms": {
+                "avg": round(self.latency_total_ms / calls, 2),
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "histogram": {
+                    **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.bucket_counts)},
+                    "le_inf": self.bucket_counts[-1]
+                }
+            }
+        }
+
+
+class LLMMetrics:
+    """Per-call-site LLM instrumentation, keyed by the caller's label"""
+
+    def __init__(self):
+        self._sites: Dict[str, CallSiteMetrics] = defaultdict(CallSiteMetrics)
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, latency_ms: float, prompt_tokens: int = 0, completion_tokens: int = 0, error: bool = False, empty: bool = False, cache_hit: bool = False):
+        with self._lock:
+            self._sites[call_site or "unlabeled"].observe(
+                latency_ms, prompt_tokens, completion_tokens, error, empty, cache_hit
+            )
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {site: metrics.snapshot() for site, metrics in sorted(self._sites.items())}
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+
+
+llm_metrics = LLMMetrics()
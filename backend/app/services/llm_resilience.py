@@ -0,0 +1,122 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+import httpx
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the inference endpoint is skipped because the circuit is open"""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Failures that say the endpoint is unhealthy, rather than the request bad"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed until `failure_threshold` transient failures in a row, then open:
+    calls fail fast for `reset_timeout` seconds. After that a single probe is
+    let through (half-open); its outcome closes or re-opens the circuit.
+    Calls are settled through `guard`, so every probe ends in an outcome;
+    a probe that reports nothing within `probe_timeout` is replaced by a
+    new one. Must only be used from the LLM I/O loop.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, probe_timeout: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if (
+            (self.state == "open" and now - self.opened_at >= self.reset_timeout)
+            or (self.state == "half_open" and now - self.probe_started_at >= self.probe_timeout)
+        ):
+            self.state = "half_open"
+            self.probe_started_at = now
+            return True
+        # Open, or half-open with the probe still in flight
+        self.rejected += 1
+        return False
+
+    @contextmanager
+    def guard(self):
+        """Settle the call made inside the block.
+
+        Transient errors count as failures. Any other error still means the
+        endpoint answered, so it counts as a success. A call cancelled or
+        abandoned before it finished says nothing about the endpoint; if it
+        was the probe, the circuit goes back to open, ready for a new probe.
+        """
+        try:
+            yield
+        except Exception as e:
+            if is_transient_error(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            self.record_abandoned()
+            raise
+        self.record_success()
+
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+
+    def record_abandoned(self):
+        if self.state == "half_open":
+            self.state = "open"
+            self.opened_at = time.monotonic() - self.reset_timeout
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class LatencyTracker:
+    """Rolling window of request latencies (seconds) for percentile estimates"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the q-quantile, or None until enough samples are in"""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(q * (len(ordered) - 1))]
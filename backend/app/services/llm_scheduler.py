@@ -0,0 +1,128 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, List, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class Priority(IntEnum):
+    """LLM work classes, most urgent first"""
+    INTERACTIVE = 0  # live question / feedback turns
+    EVALUATION = 1   # post-interview reports
+    BACKFILL = 2     # offline jobs (question bank, re-scoring)
+
+
+class LLMScheduler:
+    """Bounded-concurrency admission for LLM calls by priority class.
+
+    At most `max_concurrency` calls run at once. When a slot frees up the
+    oldest waiter of the most urgent class gets it, and `reserved_interactive`
+    slots are never handed to non-interactive work, so a live turn does not
+    queue behind a burst of evaluation calls. Must only be used from the LLM
+    I/O loop.
+    """
+
+    def __init__(self, max_concurrency: int = None, reserved_interactive: int = None):
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        reserved = settings.LLM_RESERVED_INTERACTIVE_SLOTS if reserved_interactive is None else reserved_interactive
+        self.reserved_interactive = min(reserved, self.max_concurrency - 1)
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._stats = {
+            priority: {
+                "submitted": 0,
+                "completed": 0,
+                "active": 0,
+                "wait_total": 0.0,
+                "wait_max": 0.0,
+                "recent_waits": deque(maxlen=500)
+            }
+            for priority in Priority
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE):
+        """Hold one concurrency slot for the duration of the block"""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._stats[priority]["active"] -= 1
+            self._stats[priority]["completed"] += 1
+            self._active -= 1
+            self._wake()
+
+    def stats(self) -> Dict:
+        classes = {}
+        for priority, stats in self._stats.items():
+            waits = sorted(stats["recent_waits"])
+            admitted = stats["completed"] + stats["active"]
+            classes[priority.name.lower()] = {
+                "queued": sum(1 for p, _, fut in self._waiters if p == priority and not fut.done()),
+                "active": stats["active"],
+                "submitted": stats["submitted"],
+                "completed": stats["completed"],
+                "avg_wait_ms": round(stats["wait_total"] / admitted * 1000, 2) if admitted else 0.0,
+                "p95_wait_ms": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 2) if waits else 0.0,
+                "max_wait_ms": round(stats["wait_max"] * 1000, 2)
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "reserved_interactive": self.reserved_interactive,
+            "active": self._active,
+            "classes": classes
+        }
+
+    def _limit(self, priority: Priority) -> int:
+        if priority == Priority.INTERACTIVE:
+            return self.max_concurrency
+        return self.max_concurrency - self.reserved_interactive
+
+    async def _acquire(self, priority: Priority):
+        stats = self._stats[priority]
+        stats["submitted"] += 1
+        started = time.monotonic()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._wake()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot but cancelled before using it; hand it on
+                self._active -= 1
+                self._wake()
+            raise
+
+        waited = time.monotonic() - started
+        stats["active"] += 1
+        stats["wait_total"] += waited
+        stats["wait_max"] = max(stats["wait_max"], waited)
+        stats["recent_waits"].append(waited)
+
+    def _wake(self):
+        """Grant free slots to waiters in priority order"""
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            # Limits only shrink for less urgent classes, so stop at the first miss
+            if self._active >= self._limit(priority):
+                return
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
+
+
+llm_scheduler = LLMScheduler()
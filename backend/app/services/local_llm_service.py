@@ -0,0 +1,223 @@
+try:
+    import torch
+except Exception:
+    torch = None
+
+try:
+    from transformers import AutoModelForCausalLM, AutoTokenizer, TextIteratorStreamer
+except Exception:
+    AutoModelForCausalLM = None
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional, Tuple
+from app.config import get_settings
+from app.services.llm_service import BaseLLMService
+
+settings = get_settings()
+
+
+class LocalLLMService(BaseLLMService):
+    """In-process inference with quantized weights.
+
+    The model is loaded once per process. Successive prompts from the same
+    session (e.g. `generate_question`, whose role/profile/history preamble
+    barely changes between turns) reuse the KV cache of their longest common
+    token prefix, so only the new tail of the prompt is encoded.
+    """
+
+    def __init__(self, model_name: str = None, quantization: str = None, device: str = None):
+        if torch is None or AutoModelForCausalLM is None:
+            raise RuntimeError("torch/transformers not available")
+
+        self.model_name = model_name or settings.MODEL_NAME
+        self.quantization = (quantization or settings.LOCAL_LLM_QUANTIZATION).lower()
+        self.device = device or settings.LOCAL_LLM_DEVICE
+
+        if settings.LOCAL_LLM_THREADS:
+            torch.set_num_threads(settings.LOCAL_LLM_THREADS)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=settings.MODEL_CACHE_DIR)
+        self.model = self._load_model()
+        self.model.eval()
+
+        # session_id -> (prompt token ids, past_key_values for those ids)
+        self._prefix_cache: "OrderedDict[str, Tuple[torch.Tensor, tuple]]" = OrderedDict()
+        self._prefix_lock = threading.Lock()
+        self.prefix_tokens_reused = 0
+        self.prompt_tokens_total = 0
+
+        # The model is not safe to run concurrently; one worker serialises calls
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-llm")
+
+    def _load_model(self):
+        """Load the model with int8/int4 weights where the platform allows"""
+        if self.device.startswith("cuda") and self.quantization in ("int8", "int4"):
+            from transformers import BitsAndBytesConfig
+            return AutoModelForCausalLM.from_pretrained(
+                self.model_name,
+                cache_dir=settings.MODEL_CACHE_DIR,
+                quantization_config=BitsAndBytesConfig(
+                    load_in_8bit=self.quantization == "int8",
+                    load_in_4bit=self.quantization == "int4"
+                ),
+                device_map="auto"
+            )
+
+        model = AutoModelForCausalLM.from_pretrained(
+            self.model_name,
+            cache_dir=settings.MODEL_CACHE_DIR,
+            torch_dtype=torch.float32,
+            low_cpu_mem_usage=True
+        )
+
+        if self.quantization in ("int8", "int4"):
+            if self.quantization == "int4":
+                # bitsandbytes 4-bit kernels need CUDA; int8 dynamic quantization is the CPU path
+                print("int4 quantization requires CUDA; using int8 dynamic quantization on CPU")
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        return model
+
+    def _format_prompt(self, prompt: str, system_prompt: Optional[str]) -> str:
+        content = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if getattr(self.tokenizer, "chat_template", None):
+            return self.tokenizer.apply_chat_template(
+                [{"role": "user", "content": content}],
+                tokenize=False,
+                add_generation_prompt=True
+            )
+        return content
+
+    def _prefix_past(self, session_id: Optional[str], input_ids: "torch.Tensor") -> Optional[tuple]:
+        """Return a KV cache covering all prompt tokens but the last one.
+
+        The cached prefix for the session is cropped to the longest common
+        prefix with the new prompt and only the remaining tokens are encoded.
+        The last token is left for `generate` to process.
+        """
+        if not session_id:
+            return None
+
+        target = input_ids.shape[1] - 1
+        if target <= 0:
+            return None
+
+        with self._prefix_lock:
+            cached = self._prefix_cache.get(session_id)
+
+        reused = 0
+        past = None
+        if cached is not None:
+            cached_ids, cached_past = cached
+            limit = min(cached_ids.shape[1], target)
+            matches = (cached_ids[0, :limit] == input_ids[0, :limit]).long()
+            reused = int(matches.cumprod(0).sum().item())
+            if reused:
+                past = tuple(
+                    (key[:, :, :reused, :], value[:, :, :reused, :])
+                    for key, value in cached_past
+                )
+
+        if reused < target:
+            outputs = self.model(
+                input_ids=input_ids[:, reused:target],
+                past_key_values=past,
+                use_cache=True
+            )
+            past = outputs.past_key_values
+            if hasattr(past, "to_legacy_cache"):
+                past = past.to_legacy_cache()
+
+        self.prefix_tokens_reused += reused
+        self.prompt_tokens_total += input_ids.shape[1]
+
+        with self._prefix_lock:
+            self._prefix_cache[session_id] = (input_ids[:, :target], past)
+            self._prefix_cache.move_to_end(session_id)
+            while len(self._prefix_cache) > settings.LOCAL_LLM_KV_CACHE_SESSIONS:
+                self._prefix_cache.popitem(last=False)
+
+        return past
+
+    def _generation_kwargs(self, prompt: str, max_new_tokens: int, temperature: float, system_prompt: str, session_id: str) -> dict:
+        input_ids = self.tokenizer(
+            self._format_prompt(prompt, system_prompt),
+            return_tensors="pt",
+            add_special_tokens=not getattr(self.tokenizer, "chat_template", None)
+        ).input_ids.to(self.model.device)
+
+        kwargs = {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+            "past_key_values": self._prefix_past(session_id, input_ids),
+            "max_new_tokens": max_new_tokens or settings.MAX_NEW_TOKENS,
+            "pad_token_id": self.tokenizer.eos_token_id
+        }
+        if temperature:
+            kwargs.update(do_sample=True, temperature=temperature)
+        else:
+            kwargs.update(do_sample=False)
+        return kwargs
+
+    def _generate_sync(self, prompt: str, max_new_tokens: int, temperature: float, system_prompt: str, session_id: str) -> str:
+        with torch.inference_mode():
+            kwargs = self._generation_kwargs(prompt, max_new_tokens, temperature, system_prompt, session_id)
+            output = self.model.generate(**kwargs)
+        new_tokens = output[0, kwargs["input_ids"].shape[1]:]
+        return self.tokenizer.decode(new_tokens, skip_special_tokens=True).strip()
+
+    def _stream_sync(self, streamer, prompt: str, max_new_tokens: int, temperature: float, system_prompt: str, session_id: str):
+        try:
+            with torch.inference_mode():
+                kwargs = self._generation_kwargs(prompt, max_new_tokens, temperature, system_prompt, session_id)
+                self.model.generate(streamer=streamer, **kwargs)
+        finally:
+            # Unblock the consumer even if generation failed
+            streamer.end()
+
+    async def _agenerate(self, prompt: str, max_new_tokens: int = None, temperature: float = None, system_prompt: str = None, session_id: str = None) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._generate_sync,
+            prompt, max_new_tokens, temperature, system_prompt, session_id
+        )
+
+    async def _astream(self, prompt: str, max_new_tokens: int = None, temperature: float = None, system_prompt: str = None, session_id: str = None) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        generation = loop.run_in_executor(
+            self._executor, self._stream_sync,
+            streamer, prompt, max_new_tokens, temperature, system_prompt, session_id
+        )
+
+        # The streamer's iterator blocks, so pull each chunk from a worker thread
+        while True:
+            chunk = await loop.run_in_executor(None, next, streamer, None)
+            if chunk is None:
+                break
+            if chunk:
+                yield chunk
+
+        # Surface generation errors to the caller
+        await generation
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats["quantization"] = self.quantization
+        stats["prefix_cache"] = {
+            "sessions": len(self._prefix_cache),
+            "prompt_tokens": self.prompt_tokens_total,
+            "reused_tokens": self.prefix_tokens_reused,
+            "reuse_rate": round(self.prefix_tokens_reused / self.prompt_tokens_total, 4) if self.prompt_tokens_total else 0.0
+        }
+        return stats
+
+    def release_session(self, session_id: str):
+        with self._prefix_lock:
+            self._prefix_cache.pop(session_id, None)
+
+    async def _aclose(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import random
+import re
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+import numpy as np
+from app.config import get_settings
+from app.services.llm_scheduler import Priority
+from app.services.llm_service import llm_loop, llm_service
+from app.utils.embeddings import get_encoder
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+INTERVIEW_ROLES = [
+    "Software Engineer", "Data Scientist", "Product Manager",
+    "Sales Manager", "Marketing Manager", "Business Analyst",
+    "UI/UX Designer", "DevOps Engineer", "Project Manager",
+    "Customer Success Manager", "Retail Associate", "HR Manager"
+]
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+class QuestionBank:
+    """Pools of pre-generated opening questions per (role, difficulty).
+
+    Pools live in Redis as lists of {"question", "skills"} entries. `take`
+    pops the entry whose skills best overlap the candidate's profile, so the
+    first question costs no LLM call, and schedules a BACKFILL-priority
+    refill once a pool runs low. New questions that are near-duplicates of
+    pooled ones (cosine similarity of sentence embeddings) are dropped.
+    """
+
+    def __init__(self, pool_size: int = None, min_pool: int = None, batch_size: int = None):
+        self.pool_size = pool_size or settings.QUESTION_BANK_POOL_SIZE
+        self.min_pool = min_pool or settings.QUESTION_BANK_MIN_POOL
+        self.batch_size = batch_size or settings.QUESTION_BANK_BATCH_SIZE
+        # Running refills per pool; `take` runs on several threads at once
+        self._refills: Dict[str, Future] = {}
+        self._refills_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.duplicates_dropped = 0
+
+    def _key(self, role: str, difficulty: str) -> str:
+        return f"question_bank:{role}:{difficulty}"
+
+    def take(self, role: str, difficulty: str, skills: List[str]) -> Optional[str]:
+        """Pop the pooled opening question that best matches the profile"""
+        key = self._key(role, difficulty)
+        question = None
+        try:
+            # Another worker may take the same entry first; retry once
+            for _ in range(2):
+                entries = redis_client.client.lrange(key, 0, -1)
+                if not entries:
+                    break
+                best = max(entries, key=lambda raw: self._overlap(json.loads(raw), skills))
+                if redis_client.client.lrem(key, 1, best):
+                    question = json.loads(best)["question"]
+                    break
+            remaining = redis_client.client.llen(key)
+        except Exception as e:
+            print(f"Question bank error: {e}")
+            return None
+
+        if question is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if remaining < self.min_pool:
+            self.schedule_refill(role, difficulty)
+        return question
+
+    def schedule_refill(self, role: str, difficulty: str):
+        """Top up a pool in the background unless a refill is already running"""
+        key = self._key(role, difficulty)
+        with self._refills_lock:
+            # Finished refills are dropped, so only running ones are kept
+            self._refills = {name: future for name, future in self._refills.items() if not future.done()}
+            if key in self._refills:
+                return
+            self._refills[key] = llm_loop.submit(self.afill(role, difficulty))
+
+    async def afill(self, role: str, difficulty: str, target: int = None) -> int:
+        """Generate questions until the pool holds `target` entries; returns the pool size"""
+        target = target or self.pool_size
+        key = self._key(role, difficulty)
+        # Give up after a few rounds that add nothing (e.g. all duplicates)
+        stalls = 0
+        while stalls < 3:
+            pool = [json.loads(raw) for raw in await asyncio.to_thread(redis_client.client.lrange, key, 0, -1)]
+            if len(pool) >= target:
+                return len(pool)
+
+            generated = await self._generate(role, difficulty, pool)
+            fresh = await asyncio.to_thread(self._dedupe, generated, pool)
+            fresh = fresh[:target - len(pool)]
+            if fresh:
+                await asyncio.to_thread(redis_client.client.rpush, key, *[json.dumps(entry) for entry in fresh])
+                stalls = 0
+            else:
+                stalls += 1
+        return len(pool)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        pools = {}
+        try:
+            for role in INTERVIEW_ROLES:
+                for difficulty in DIFFICULTIES:
+                    pools[f"{role}:{difficulty}"] = redis_client.client.llen(self._key(role, difficulty))
+        except Exception as e:
+            print(f"Question bank error: {e}")
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "duplicates_dropped": self.duplicates_dropped,
+            "refills_running": self._running_refills(),
+            "pools": pools
+        }
+
+    def _running_refills(self) -> int:
+        with self._refills_lock:
+            return sum(1 for future in self._refills.values() if not future.done())
+
+    def _overlap(self, entry: Dict, skills: List[str]) -> float:
+        wanted = {skill.lower() for skill in skills}
+        tagged = {skill.lower() for skill in entry.get("skills", [])}
+        text = entry["question"].lower()
+        # Tags count fully, skills mentioned in the question text count half
+        return len(wanted & tagged) + 0.5 * sum(1 for skill in wanted - tagged if skill in text)
+
+    async def _generate(self, role: str, difficulty: str, pool: List[Dict]) -> List[Dict]:
+        existing = "\n".join(f"- {entry['question']}" for entry in random.sample(pool, min(len(pool), 15)))
+        prompt = f"""
+Write {self.batch_size} different opening interview questions for a {difficulty} level {role} interview.
+Cover a broad range of the skills and topics relevant to the role. Each question must stand on its own.
+{f"Do not repeat or rephrase these existing questions:{chr(10)}{existing}{chr(10)}" if existing else ""}
+Write one question per line in this format:
+<question>? | <skill 1>, <skill 2>
+"""
+
+        text = await llm_service.agenerate(
+            prompt=prompt,
+            system_prompt="You are an expert interviewer writing a question bank.",
+            max_new_tokens=60 * self.batch_size,
+            temperature=0.9,
+            priority=Priority.BACKFILL,
+            call_site="question_bank"
+        )
+        return self._parse(text)
+
+    def _parse(self, text: str) -> List[Dict]:
+        entries = []
+        for line in text.splitlines():
+            question, _, skills = line.partition("|")
+            # Drop list markers like "1." or "-"
+            question = re.sub(r"^\s*(\d+[.)]|[-*])\s*", "", question).strip()
+            if not question.endswith("?"):
+                continue
+            entries.append({
+                "question": question,
+                "skills": [skill.strip() for skill in skills.split(",") if skill.strip()]
+            })
+        return entries
+
+    def _dedupe(self, candidates: List[Dict], pool: List[Dict]) -> List[Dict]:
+        """Drop candidates that repeat a pooled question or each other"""
+        encoder = get_encoder(settings.QUESTION_BANK_EMBEDDING_MODEL)
+        if encoder is None:
+            # Without embeddings only exact (normalised) repeats are caught
+            seen = {entry["question"].lower() for entry in pool}
+            fresh = []
+            for entry in candidates:
+                if entry["question"].lower() not in seen:
+                    seen.add(entry["question"].lower())
+                    fresh.append(entry)
+            self.duplicates_dropped += len(candidates) - len(fresh)
+            return fresh
+
+        texts = [entry["question"] for entry in pool + candidates]
+        if not texts:
+            return []
+        embeddings = encoder.encode(texts, normalize_embeddings=True)
+        kept = list(range(len(pool)))
+        fresh = []
+        for i, entry in enumerate(candidates, start=len(pool)):
+            if kept and float(np.max(embeddings[kept] @ embeddings[i])) >= settings.QUESTION_BANK_DEDUP_THRESHOLD:
+                self.duplicates_dropped += 1
+                continue
+            kept.append(i)
+            fresh.append(entry)
+        return fresh
+
+
+question_bank = QuestionBank()
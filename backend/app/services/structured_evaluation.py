@@ -0,0 +1,176 @@
+import asyncio
+import json
+from typing import Dict, List, Literal, Optional, Set, Tuple
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from app.config import get_settings
+from app.services.llm_scheduler import Priority
+from app.services.llm_service import llm_service
+
+settings = get_settings()
+
+class ImprovementArea(BaseModel):
+    area: str = Field(min_length=1)
+    action_plan: str = Field(min_length=1)
+    priority: Literal["high", "medium", "low"]
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def lowercase(cls, value):
+        return value.strip().lower() if isinstance(value, str) else value
+
+class StructuredEvaluation(BaseModel):
+    communication_score: float = Field(ge=0, le=100)
+    technical_score: float = Field(ge=0, le=100)
+    problem_solving_score: float = Field(ge=0, le=100)
+    confidence_score: float = Field(ge=0, le=100)
+    strengths: List[str] = Field(min_length=1)
+    weaknesses: List[str] = Field(min_length=1)
+    improvement_areas: List[ImprovementArea] = Field(min_length=1)
+    recommendations: str = Field(min_length=1)
+
+    @field_validator("strengths", "weaknesses", "improvement_areas", mode="before")
+    @classmethod
+    def keep_top_five(cls, value):
+        # Over-long lists are trimmed here rather than sent back for repair
+        return value[:5] if isinstance(value, list) else value
+
+# What each field should hold, as shown to the model
+FIELD_SPECS = {
+    "communication_score": "<0-100>",
+    "technical_score": "<0-100>",
+    "problem_solving_score": "<0-100>",
+    "confidence_score": "<0-100>",
+    "strengths": '["<strength>", ...] (3-5 items)',
+    "weaknesses": '["<weakness>", ...] (3-5 items)',
+    "improvement_areas": '[{"area": "<one of the weaknesses>", "action_plan": "<2-3 action items, resources or practice methods, and a timeline>", "priority": "high|medium|low"}, ...] (one per weakness)',
+    "recommendations": '"<next steps, recommended resources, practice strategies and a timeline>"'
+}
+
+# Known-valid values, used to validate the other fields on their own
+_VALID_STUB = {
+    "communication_score": 0,
+    "technical_score": 0,
+    "problem_solving_score": 0,
+    "confidence_score": 0,
+    "strengths": ["-"],
+    "weaknesses": ["-"],
+    "improvement_areas": [{"area": "-", "action_plan": "-", "priority": "low"}],
+    "recommendations": "-"
+}
+
+class StructuredEvaluator:
+    """Single-pass evaluation returning one schema-validated JSON document.
+
+    One call asks for every field at once. The reply is validated with
+    `StructuredEvaluation`; valid fields are kept as they are, and only the
+    fields that are missing or invalid get a targeted follow-up call each,
+    run concurrently. Fields still invalid after `max_repairs` attempts are
+    reported in `unresolved_fields` instead of being silently defaulted.
+    """
+
+    def __init__(self, max_new_tokens: int = None, max_repairs: int = 1):
+        self.max_new_tokens = max_new_tokens or settings.EVAL_STRUCTURED_MAX_TOKENS
+        self.max_repairs = max_repairs
+        self.evaluations = 0
+        self.repairs: Dict[str, int] = {}
+        self.unresolved: Dict[str, int] = {}
+
+    async def aevaluate(self, transcript: str, evaluations: str, role: str, priority: Priority = Priority.EVALUATION) -> Tuple[Dict, Dict]:
+        """Return (valid fields, details of repaired and unresolved fields)"""
+        self.evaluations += 1
+        context = self._context(transcript, evaluations, role)
+
+        fields = "\n".join(f'  "{name}": {spec},' for name, spec in FIELD_SPECS.items()).rstrip(",")
+        text = await llm_service.agenerate(
+            prompt=f"{context}\nReturn a single JSON object with exactly these fields and nothing else:\n{{\n{fields}\n}}\n",
+            system_prompt="You are an expert interview evaluator. Reply with valid JSON only.",
+            max_new_tokens=self.max_new_tokens,
+            temperature=0.3,
+            priority=priority,
+            call_site="structured_evaluation"
+        )
+
+        data = self._parse(text) or {}
+        valid, invalid = self._validate(data)
+        repaired = []
+
+        for _ in range(self.max_repairs):
+            if not invalid:
+                break
+            fixes = await asyncio.gather(*[self._repair(context, name, valid, priority) for name in sorted(invalid)])
+            candidate = {**valid, **{name: value for name, value in zip(sorted(invalid), fixes) if value is not None}}
+            still_valid, invalid = self._validate(candidate)
+            repaired += [name for name in still_valid if name not in valid]
+            valid = still_valid
+
+        for name in repaired:
+            self.repairs[name] = self.repairs.get(name, 0) + 1
+        for name in invalid:
+            self.unresolved[name] = self.unresolved.get(name, 0) + 1
+        if invalid:
+            print(f"Structured evaluation left fields unresolved: {', '.join(sorted(invalid))}")
+
+        return valid, {"repaired_fields": sorted(repaired), "unresolved_fields": sorted(invalid)}
+
+    def stats(self) -> Dict:
+        return {
+            "evaluations": self.evaluations,
+            "repairs": dict(self.repairs),
+            "unresolved": dict(self.unresolved)
+        }
+
+    def _context(self, transcript: str, evaluations: str, role: str) -> str:
+        return f"""
+Evaluate this interview for a {role} position.
+
+Interview Transcript:
+{transcript}
+
+Question-by-question evaluations:
+{evaluations}
+"""
+
+    async def _repair(self, context: str, name: str, valid: Dict, priority: Priority):
+        """Ask again for a single field; returns its raw value or None"""
+        text = await llm_service.agenerate(
+            prompt=f"""{context}
+Evaluation so far:
+{json.dumps(valid, indent=2)}
+
+Field to fix: {name}
+Return a JSON object with only this field:
+{{"{name}": {FIELD_SPECS[name]}}}
+""",
+            system_prompt="You are an expert interview evaluator. Reply with valid JSON only.",
+            max_new_tokens=self.max_new_tokens // 2 if name in ("improvement_areas", "recommendations") else 150,
+            temperature=0.3,
+            priority=priority,
+            call_site="structured_evaluation_repair"
+        )
+        data = self._parse(text)
+        return data.get(name) if data else None
+
+    def _parse(self, text: str) -> Optional[Dict]:
+        """The outermost JSON object in a reply, ignoring code fences and chatter"""
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _validate(self, data: Dict) -> Tuple[Dict, Set[str]]:
+        """Split data into validated fields and the names of missing or invalid ones"""
+        try:
+            return StructuredEvaluation.model_validate(data).model_dump(), set()
+        except ValidationError as e:
+            invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+
+        invalid |= set(FIELD_SPECS) - set(data)
+        stub = {**_VALID_STUB, **{name: value for name, value in data.items() if name in FIELD_SPECS and name not in invalid}}
+        valid = StructuredEvaluation.model_validate(stub).model_dump()
+        return {name: value for name, value in valid.items() if name not in invalid}, invalid
+
+structured_evaluator = StructuredEvaluator()
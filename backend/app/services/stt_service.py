@@ -8,83 +8,142 @@ try:
 except Exception:
     WhisperModel = None
 
-try:
-    import numpy as np
-except Exception:
-    np = None
+import asyncio
+import os
+import tempfile
+import time
+import requests
 from typing import Optional
 from app.config import get_settings
 
 settings = get_settings()
 
 
+def _get_hf_token() -> Optional[str]:
+    return os.environ.get("HUGGINGFACE_API_KEY") or os.environ.get("HUGGINGFACE_TOKEN") or os.environ.get("HF_API_KEY") or os.environ.get("HF_TOKEN")
+
+
 class STTService:
+    """Local Whisper transcription with faster-whisper"""
+
     def __init__(self):
         if WhisperModel is None:
             raise RuntimeError("faster_whisper not available")
 
+        cuda = torch is not None and torch.cuda.is_available()
         self.model = WhisperModel(
             settings.WHISPER_MODEL,
-            device="cuda" if torch.cuda.is_available() else "cpu",
-            compute_type="float16" if torch.cuda.is_available() else "int8"
+            device="cuda" if cuda else "cpu",
+            compute_type="float16" if cuda else "int8",
+            download_root=settings.MODEL_CACHE_DIR
         )
-    
+
     def transcribe(self, audio_path: str, language: str = "en") -> dict:
         """Transcribe audio file to text"""
-        segments, info = self.model.transcribe(
-            audio_path,
-            language=language,
-            settings = get_settings()
+        segments, info = self.model.transcribe(audio_path, language=language)
+        return {
+            "text": " ".join(segment.text.strip() for segment in segments).strip(),
+            "language": info.language
+        }
+
+
+class HuggingFaceSTTService:
+    def __init__(self, model: str = None):
+        self.model = model or settings.WHISPER_MODEL
+        # Allow full repo id like 'openai/whisper-large-v2' or shorthand
+        self.api_url = f"https://api-inference.huggingface.co/models/{self.model}"
+        self.token = _get_hf_token()
+
+    def transcribe(self, audio_path: str) -> dict:
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        try:
+            with open(audio_path, "rb") as f:
+                resp = requests.post(self.api_url, headers=headers, data=f, timeout=120)
+            resp.raise_for_status()
+            # Response may be JSON with 'text' or a dict
+            data = resp.json()
+            if isinstance(data, dict) and "text" in data:
+                return {"text": data["text"]}
+            if isinstance(data, list) and data and isinstance(data[0], dict) and "text" in data[0]:
+                return {"text": data[0]["text"]}
+            # Fallback: try plain text
+            return {"text": str(data)}
+        except Exception as e:
+            print(f"STT error: {e}")
+            return {"text": ""}
+
+
+class MockSTTService:
+    def transcribe(self, audio_path: str) -> dict:
+        return {"text": "This is a placeholder transcription."}
+
+
+class IncrementalTranscriber:
+    """Transcribes an answer while its audio is still arriving.
+
+    Chunks of one recording are appended to a buffer. `refresh` transcribes
+    everything received so far, at most once per `STT_PARTIAL_INTERVAL_MS`
+    and one run at a time, giving partial transcripts. When the candidate
+    stops, `finish` returns the last partial if it already covers all the
+    audio, so the final transcript usually costs nothing extra.
+    """
+
+    def __init__(self, service=None, suffix: str = ".webm"):
+        self.service = service or stt_service
+        self.suffix = suffix
+        self.buffer = bytearray()
+        self._transcribed_bytes = 0
+        self._text = ""
+        self._last_refresh = 0.0
+        self._running: Optional[asyncio.Task] = None
+
+    def feed(self, chunk: bytes):
+        self.buffer.extend(chunk)
+
+    def should_refresh(self) -> bool:
+        return (
+            self._running is None
+            and len(self.buffer) > self._transcribed_bytes
+            and (time.monotonic() - self._last_refresh) * 1000 >= settings.STT_PARTIAL_INTERVAL_MS
         )
-        import os
-        import requests
-        from app.config import get_settings
-        from typing import Optional
-
-            
-
-
-        def _get_hf_token() -> Optional[str]:
-            return os.environ.get("HUGGINGFACE_API_KEY") or os.environ.get("HUGGINGFACE_TOKEN") or os.environ.get("HF_API_KEY") or os.environ.get("HF_TOKEN")
-
-
-        class HuggingFaceSTTService:
-            def __init__(self, model: str = None):
-                self.model = model or settings.WHISPER_MODEL
-                # Allow full repo id like 'openai/whisper-large-v2' or shorthand
-                self.api_url = f"https://api-inference.huggingface.co/models/{self.model}"
-                self.token = _get_hf_token()
-
-            def transcribe(self, audio_path: str) -> dict:
-                headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
-                try:
-                    with open(audio_path, "rb") as f:
-                        resp = requests.post(self.api_url, headers=headers, data=f, timeout=120)
-                    resp.raise_for_status()
-                    # Response may be JSON with 'text' or a dict
-                    data = resp.json()
-                    if isinstance(data, dict) and "text" in data:
-                        return {"text": data["text"]}
-                    if isinstance(data, list) and data and isinstance(data[0], dict) and "text" in data[0]:
-                        return {"text": data[0]["text"]}
-                    # Fallback: try plain text
-                    return {"text": str(data)}
-                except Exception as e:
-                    print(f"STT error: {e}")
-                    return {"text": ""}
-
-
-        class MockSTTService:
-            def transcribe(self, audio_path: str) -> dict:
-                return {"text": "This is a placeholder transcription."}
-
-
-        if _get_hf_token():
-            stt_service = HuggingFaceSTTService()
-        else:
-            stt_service = MockSTTService()
 
+    async def refresh(self) -> str:
+        """Transcribe all audio received so far; returns the partial transcript"""
+        self._last_refresh = time.monotonic()
+        self._running = asyncio.ensure_future(self._transcribe(bytes(self.buffer)))
+        try:
+            return await self._running
+        finally:
+            self._running = None
+
+    async def finish(self) -> str:
+        """Final transcript of the whole recording"""
+        if self._running is not None:
+            await asyncio.gather(self._running, return_exceptions=True)
+        if self._transcribed_bytes < len(self.buffer):
+            await self._transcribe(bytes(self.buffer))
+        return self._text
+
+    async def _transcribe(self, audio: bytes) -> str:
+        text = await asyncio.to_thread(self._transcribe_bytes, audio)
+        # A slower, older run must not overwrite a newer transcript
+        if len(audio) >= self._transcribed_bytes:
+            self._transcribed_bytes = len(audio)
+            self._text = text
+        return self._text
+
+    def _transcribe_bytes(self, audio: bytes) -> str:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=self.suffix) as temp_audio:
+            temp_audio.write(audio)
+            temp_audio_path = temp_audio.name
+        try:
+            return self.service.transcribe(temp_audio_path)["text"]
+        finally:
+            os.unlink(temp_audio_path)
+
+
+# Local Whisper when installed, else the hosted API when a token is set, else a stub
 try:
     stt_service = STTService()
 except Exception:
-    stt_service = MockSTTService()
\ No newline at end of file
+    stt_service = HuggingFaceSTTService() if _get_hf_token() else MockSTTService()
@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional
+from app.config import get_settings
+from app.services.llm_scheduler import Priority
+from app.services.llm_service import llm_loop, llm_service
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+settings = get_settings()
+
+
+class TranscriptCompactor:
+    """Fit a list of transcript entries into a token budget.
+
+    The most recent entries are kept verbatim. Older entries are grouped into
+    fixed chunks of `chunk_size` counted from the start of the interview, and
+    each chunk is replaced by an LLM summary. Chunk boundaries never move, so
+    a summary is computed once and reused from the `summaries` dict the caller
+    passes in (the interview's summaries in `session_store`, see
+    `InterviewGraph`). The result never exceeds the budget.
+    """
+
+    def __init__(self, chunk_size: int = None, summary_tokens: int = None, recent_share: float = 0.6):
+        self.chunk_size = chunk_size or settings.EVAL_SUMMARY_CHUNK_TURNS
+        self.summary_tokens = summary_tokens or settings.EVAL_SUMMARY_MAX_TOKENS
+        self.recent_share = recent_share
+        self.summaries_generated = 0
+        self.summaries_reused = 0
+
+    def compact(self, kind: str, entries: List[str], budget: int, summaries: Optional[Dict[str, str]] = None) -> str:
+        """Blocking wrapper around `acompact` for sync callers"""
+        return llm_loop.run(self.acompact(kind, entries, budget, summaries))
+
+    async def acompact(self, kind: str, entries: List[str], budget: int, summaries: Optional[Dict[str, str]] = None, priority: Priority = Priority.EVALUATION) -> str:
+        """Render entries within budget tokens, summarising the oldest ones"""
+        if summaries is None:
+            summaries = {}
+
+        full = "\n".join(entries)
+        if count_tokens(full) <= budget:
+            return full
+
+        # Keep the newest entries that fit in the recent share of the budget
+        recent_budget = int(budget * self.recent_share)
+        split = len(entries)
+        used = 0
+        while split > 0:
+            cost = count_tokens(entries[split - 1]) + 1
+            if used + cost > recent_budget:
+                break
+            used += cost
+            split -= 1
+
+        # Summaries cover whole chunks only; the partial chunk stays verbatim
+        split -= split % self.chunk_size
+        chunks = [(start, entries[start:start + self.chunk_size]) for start in range(0, split, self.chunk_size)]
+        summary_texts = await asyncio.gather(*[
+            self._summary(kind, start, chunk, summaries, priority) for start, chunk in chunks
+        ])
+
+        older = "\n".join(
+            f"[Summary of {kind} {start + 1}-{start + len(chunk)}]: {text}"
+            for (start, chunk), text in zip(chunks, summary_texts)
+        )
+        older = truncate_to_tokens(older, budget - recent_budget, keep="end")
+        recent = "\n".join(entries[split:])
+        recent = truncate_to_tokens(recent, budget - count_tokens(older) - 1, keep="end")
+
+        return f"{older}\n{recent}" if older else recent
+
+    def stats(self) -> Dict:
+        return {
+            "summaries_generated": self.summaries_generated,
+            "summaries_reused": self.summaries_reused
+        }
+
+    async def _summary(self, kind: str, start: int, chunk: List[str], summaries: Dict[str, str], priority: Priority) -> str:
+        text = "\n".join(chunk)
+        # The content hash keeps a cached summary from outliving an edited transcript
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        key = f"{kind}:{start}-{start + len(chunk)}:{digest}"
+        if key in summaries:
+            self.summaries_reused += 1
+            return summaries[key]
+
+        prompt = f"""
+Summarize this part of an interview in a few sentences. Keep the topics covered, notable claims, and any strong or weak points.
+
+{truncate_to_tokens(text, settings.EVAL_TRANSCRIPT_TOKEN_BUDGET)}
+
+Summary:
+"""
+
+        summary = await llm_service.agenerate(
+            prompt=prompt,
+            max_new_tokens=self.summary_tokens,
+            temperature=0.3,
+            cache=True,
+            priority=priority,
+            call_site="transcript_summary"
+        )
+        summary = summary.strip()
+        if summary:
+            # A failed summary is retried next time instead of being cached empty
+            summaries[key] = summary
+            self.summaries_generated += 1
+        return summary
+
+
+transcript_compactor = TranscriptCompactor()
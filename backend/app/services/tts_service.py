@@ -16,33 +16,35 @@ class HuggingFaceTTSService:
         self.api_url = f"https://api-inference.huggingface.co/models/{self.model}"
         self.token = _get_hf_token()
 
-    def synthesize(self, text: str, output_path: str) -> str:
+    def synthesize_bytes(self, text: str) -> bytes:
+        """Audio for text, or b"" on failure"""
         headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
         payload = {"inputs": text}
         try:
             resp = requests.post(self.api_url, headers=headers, json=payload, timeout=120)
             resp.raise_for_status()
             # Response should be audio bytes (wav/mp3)
-            content_type = resp.headers.get("content-type", "")
-            data = resp.content
-            # Ensure output directory exists
+            return resp.content
+        except Exception as e:
+            print(f"TTS error: {e}")
+            return b""
+
+    def synthesize(self, text: str, output_path: str) -> str:
+        data = self.synthesize_bytes(text)
+        # An empty file is written on failure
+        try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             with open(output_path, "wb") as f:
                 f.write(data)
-            return output_path
         except Exception as e:
             print(f"TTS error: {e}")
-            # fallback: create empty file
-            try:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(b"")
-            except Exception:
-                pass
-            return output_path
+        return output_path
 
 
 class MockTTSService:
+    def synthesize_bytes(self, text: str) -> bytes:
+        return b""
+
     def synthesize(self, text: str, output_path: str) -> str:
         try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -0,0 +1,78 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from app.config import get_settings
+import numpy as np
+
+settings = get_settings()
+
+SCORE_DIMENSIONS = ("communication", "technical", "problem_solving", "confidence")
+
+# Asked for at the end of each answer analysis
+SCORES_FORMAT = """Then score the response (0-100) in this exact format:
+Communication: [score]
+Technical: [score]
+Problem Solving: [score]
+Confidence: [score]
+"""
+
+_SCORE_PATTERNS = {
+    "communication": re.compile(r"^\W*Communication\W*(\d+(?:\.\d+)?)", re.IGNORECASE | re.MULTILINE),
+    "technical": re.compile(r"^\W*Technical\W*(\d+(?:\.\d+)?)", re.IGNORECASE | re.MULTILINE),
+    "problem_solving": re.compile(r"^\W*Problem[ _-]Solving\W*(\d+(?:\.\d+)?)", re.IGNORECASE | re.MULTILINE),
+    "confidence": re.compile(r"^\W*Confidence\W*(\d+(?:\.\d+)?)", re.IGNORECASE | re.MULTILINE)
+}
+
+def parse_turn_scores(text: str) -> Tuple[str, Dict[str, float]]:
+    """Split an answer analysis into its notes and the dimension scores it gave.
+
+    Dimensions the model left out, or scored outside 0-100, are omitted
+    rather than defaulted, so they do not drag the aggregate.
+    """
+    scores = {}
+    start = len(text)
+    for name, pattern in _SCORE_PATTERNS.items():
+        match = pattern.search(text)
+        if match is None:
+            continue
+        start = min(start, match.start())
+        value = float(match.group(1))
+        if 0 <= value <= 100:
+            scores[name] = value
+    return text[:start].strip(), scores
+
+def question_weights(count: int, weighting: str = None) -> np.ndarray:
+    """Weight of each answer in the final scores.
+
+    uniform: every answer counts the same. recency: weights grow linearly
+    from the first answer to the last, as later questions build on
+    follow-ups and usually probe deeper.
+    """
+    weighting = weighting or settings.EVAL_SCORE_WEIGHTING
+    if weighting == "recency":
+        return np.arange(1, count + 1, dtype=float)
+    return np.ones(count)
+
+def aggregate_turn_scores(evaluation_notes: List[Dict], weighting: str = None) -> Optional[Dict[str, float]]:
+    """Final scores as a weighted mean of the per-answer scores.
+
+    Returns None when some dimension was never scored, so callers can fall
+    back to scoring the whole interview at once.
+    """
+    if not evaluation_notes:
+        return None
+
+    # answers x dimensions, NaN where an answer has no score for a dimension
+    matrix = np.array([
+        [note.get("scores", {}).get(name, np.nan) for name in SCORE_DIMENSIONS]
+        for note in evaluation_notes
+    ], dtype=float)
+    scored = ~np.isnan(matrix)
+    if not scored.any(axis=0).all():
+        return None
+
+    weights = question_weights(len(evaluation_notes), weighting)[:, None] * scored
+    means = np.nansum(matrix * weights, axis=0) / weights.sum(axis=0)
+
+    scores = {name: round(float(value), 1) for name, value in zip(SCORE_DIMENSIONS, means)}
+    scores["overall"] = round(float(means.mean()), 1)
+    return scores
@@ -0,0 +1,144 @@
+import asyncio
+import base64
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from typing import AsyncIterator, Dict, List, Optional
+from app.services.tts_service import tts_service
+
+# A sentence ends at . ! or ? followed by whitespace; shorter ones are held
+# back so abbreviations like "e.g." do not become their own audio chunk
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+MIN_SENTENCE_CHARS = 20
+
+
+class SentenceSplitter:
+    """Cuts streamed tokens into complete sentences as soon as each one ends"""
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            if match.end() - start >= MIN_SENTENCE_CHARS:
+                sentences.append(self.buffer[start:match.end()].strip())
+                start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        rest, self.buffer = self.buffer.strip(), ""
+        return rest or None
+
+
+class VoiceMetrics:
+    """Recent per-stage latency of voice turns"""
+
+    def __init__(self):
+        self._timings: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict[str, float]):
+        with self._lock:
+            for name, ms in timings.items():
+                self._timings[name].append(ms)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            timings = {name: sorted(values) for name, values in self._timings.items()}
+        return {
+            name: {
+                "count": len(values),
+                "avg_ms": round(sum(values) / len(values), 1),
+                "p50_ms": values[int(0.50 * (len(values) - 1))],
+                "p95_ms": values[int(0.95 * (len(values) - 1))]
+            }
+            for name, values in timings.items() if values
+        }
+
+
+voice_metrics = VoiceMetrics()
+
+
+class VoiceTurnPipeline:
+    """Speaks the interviewer's reply while it is still being generated.
+
+    Takes the events of one streamed turn. Token events pass straight
+    through and are cut into sentences; each finished sentence is queued
+    for TTS, which runs in order on its own task, so synthesis of sentence
+    one overlaps generation of sentence two. Every event, audio included,
+    is yielded from one queue, so the caller has a single writer. The turn
+    ends with a `turn_metrics` event carrying its stage timings.
+
+    Timings are relative to `started` (end of the candidate's audio):
+    stt_ms, llm_first_token_ms, first_sentence_ms, first_audio_ms,
+    llm_ms, tts_ms (sum over sentences) and total_ms.
+    """
+
+    def __init__(self, tts=None, audio_format: str = "wav"):
+        self.tts = tts or tts_service
+        self.audio_format = audio_format
+
+    async def run(self, turn_events: AsyncIterator[Dict], started: float, stt_ms: float = 0.0) -> AsyncIterator[Dict]:
+        out: asyncio.Queue = asyncio.Queue()
+        sentences: asyncio.Queue = asyncio.Queue()
+        timings = {"stt_ms": round(stt_ms, 1), "tts_ms": 0.0}
+
+        def mark(name: str):
+            timings.setdefault(name, round((time.perf_counter() - started) * 1000, 1))
+
+        async def generate():
+            splitter = SentenceSplitter()
+            try:
+                async for event in turn_events:
+                    await out.put(event)
+                    if event["type"] != "token":
+                        continue
+                    mark("llm_first_token_ms")
+                    for sentence in splitter.feed(event["text"]):
+                        mark("first_sentence_ms")
+                        await sentences.put(sentence)
+                mark("llm_ms")
+                rest = splitter.flush()
+                if rest:
+                    mark("first_sentence_ms")
+                    await sentences.put(rest)
+            finally:
+                await sentences.put(None)
+
+        async def speak():
+            index = 0
+            while (sentence := await sentences.get()) is not None:
+                synthesis_started = time.perf_counter()
+                audio = await asyncio.to_thread(self.tts.synthesize_bytes, sentence)
+                timings["tts_ms"] += (time.perf_counter() - synthesis_started) * 1000
+                if audio:
+                    mark("first_audio_ms")
+                    await out.put({
+                        "type": "audio",
+                        "sentence": index,
+                        "text": sentence,
+                        "format": self.audio_format,
+                        "audio": base64.b64encode(audio).decode("ascii")
+                    })
+                index += 1
+
+        tasks = [asyncio.ensure_future(generate()), asyncio.ensure_future(speak())]
+        done = asyncio.gather(*tasks)
+        done.add_done_callback(lambda _: out.put_nowait(None))
+        try:
+            while (event := await out.get()) is not None:
+                yield event
+            await done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        timings["tts_ms"] = round(timings["tts_ms"], 1)
+        mark("total_ms")
+        voice_metrics.record(timings)
+        yield {"type": "turn_metrics", **timings}
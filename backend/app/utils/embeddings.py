@@ -0,0 +1,26 @@
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:
+    SentenceTransformer = None
+
+import threading
+from typing import Dict
+from app.config import get_settings
+
+settings = get_settings()
+
+_encoders: Dict[str, object] = {}
+_lock = threading.Lock()
+
+def get_encoder(model_name: str):
+    """Shared sentence-transformers model, loaded on first use; None if unavailable"""
+    if SentenceTransformer is None:
+        return None
+    with _lock:
+        if model_name not in _encoders:
+            try:
+                _encoders[model_name] = SentenceTransformer(model_name, cache_folder=settings.MODEL_CACHE_DIR)
+            except Exception as e:
+                print(f"Embedding model {model_name} unavailable: {e}")
+                _encoders[model_name] = None
+        return _encoders[model_name]
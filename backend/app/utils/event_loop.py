@@ -0,0 +1,111 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator, Optional
+
+
+class BackgroundEventLoop:
+    """Event loop running forever in a daemon thread.
+
+    Async clients (connection pools, queues, locks) are bound to the loop they
+    were created on. Keeping them on one dedicated loop lets both sync code
+    (LangGraph nodes, thread-pool endpoints) and async code (uvicorn handlers)
+    share them safely.
+    """
+
+    def __init__(self, name: str = "background-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the loop, starting its thread on first use"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever,
+                        name=self.name,
+                        daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def in_loop(self) -> bool:
+        """Check if the caller is already running on this loop"""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop and return a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Block the calling thread until the coroutine finishes on the loop"""
+        if self.in_loop():
+            coro.close()
+            raise RuntimeError(f"Cannot block on {self.name} from inside it; await instead")
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine) -> Any:
+        """Await a coroutine on the loop from any other event loop"""
+        if self.in_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def _pump(self, agen: AsyncIterator, sink: Callable[[bool, Any], None]) -> Future:
+        """Drain an async iterator on the loop, pushing (done, item) into sink"""
+        async def pump():
+            try:
+                async for item in agen:
+                    sink(False, item)
+                sink(True, None)
+            except Exception as e:
+                sink(True, e)
+        return self.submit(pump())
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """Consume an async iterator on the loop from a sync caller"""
+        items: queue.Queue = queue.Queue()
+        future = self._pump(agen, lambda done, item: items.put((done, item)))
+        try:
+            while True:
+                done, item = items.get()
+                if done:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    async def iterate_async(self, agen: AsyncIterator) -> AsyncIterator:
+        """Consume an async iterator on the loop from any other event loop"""
+        if self.in_loop():
+            async for item in agen:
+                yield item
+            return
+
+        caller_loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        future = self._pump(
+            agen,
+            lambda done, item: caller_loop.call_soon_threadsafe(items.put_nowait, (done, item))
+        )
+        try:
+            while True:
+                done, item = await items.get()
+                if done:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            future.cancel()
@@ -0,0 +1,45 @@
+import math
+from functools import lru_cache
+from app.config import get_settings
+
+settings = get_settings()
+
+
+@lru_cache()
+def _get_tokenizer():
+    """Tokenizer for MODEL_NAME if it is already cached locally, else None"""
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(
+            settings.MODEL_NAME,
+            cache_dir=settings.MODEL_CACHE_DIR,
+            local_files_only=True
+        )
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count model tokens in text, estimating when no tokenizer is available"""
+    if not text:
+        return 0
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    # ~4 characters per token is a fair average for English prose
+    return math.ceil(len(text) / 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "start") -> str:
+    """Cut text to at most max_tokens, keeping its start or its end"""
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        ids = tokenizer.encode(text, add_special_tokens=False)
+        ids = ids[:max_tokens] if keep == "start" else ids[-max_tokens:]
+        return tokenizer.decode(ids)
+    chars = max_tokens * 4
+    return text[:chars] if keep == "start" else text[-chars:]
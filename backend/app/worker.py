@@ -0,0 +1,199 @@
+"""Evaluation worker.
+
+Runs queued interview evaluations outside the API processes, so it can be
+scaled on its own:
+
+    python -m app.worker --concurrency 2
+"""
+import argparse
+import asyncio
+import os
+import socket
+from typing import Dict, Optional
+from app.agents.interview_graph import interview_graph
+from app.agents.session_store import session_store
+from app.config import get_settings
+from app.models.interview import Evaluation, Interview
+from app.models.user import User  # registers the model behind Interview.user
+from app.services.action_plan_cache import action_plan_cache
+from app.services.evaluation_queue import evaluation_queue
+from app.services.evaluation_service import evaluation_service
+from app.services.llm_metrics import llm_metrics
+from app.services.structured_evaluation import structured_evaluator
+from app.utils.database import SessionLocal
+
+settings = get_settings()
+
+class EvaluationWorker:
+    """Claims evaluation jobs and runs up to `concurrency` of them at once.
+
+    A job is safe to run more than once: if the interview already has an
+    evaluation (say the previous worker died after saving it), that one is
+    reported instead of generating another.
+    """
+
+    def __init__(self, concurrency: int = None):
+        self.concurrency = concurrency or settings.EVAL_WORKER_CONCURRENCY
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run(self):
+        print(f"Evaluation worker {self.worker_id} started with concurrency {self.concurrency}")
+        await asyncio.gather(
+            self._reap(),
+            self._publish_stats(),
+            *[self._consume() for _ in range(self.concurrency)]
+        )
+
+    async def _consume(self):
+        while True:
+            job_id = await asyncio.to_thread(evaluation_queue.claim, 5.0)
+            if job_id is not None:
+                await self.process(job_id)
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(evaluation_queue.lease_seconds / 2)
+            try:
+                requeued = await asyncio.to_thread(evaluation_queue.requeue_expired)
+                if requeued:
+                    print(f"Requeued {requeued} evaluation job(s) from lost workers")
+            except Exception as e:
+                print(f"Evaluation reaper error: {e}")
+
+    async def _publish_stats(self, interval: float = 10.0):
+        """Evaluations run here, not in the API, so /metrics reads their stats from Redis"""
+        while True:
+            stats = {
+                "call_sites": llm_metrics.snapshot(),
+                "evaluation_stages": evaluation_service.stats()
+            }
+            if evaluation_service.mode == "structured":
+                stats["structured_evaluation"] = structured_evaluator.stats()
+            if settings.ACTION_PLAN_CACHE_ENABLED:
+                stats["action_plan_cache"] = action_plan_cache.stats()
+            try:
+                await asyncio.to_thread(evaluation_queue.publish_worker_stats, self.worker_id, stats, int(interval * 3))
+            except Exception as e:
+                print(f"Could not publish worker stats: {e}")
+            await asyncio.sleep(interval)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(evaluation_queue.lease_seconds / 3)
+            await asyncio.to_thread(evaluation_queue.heartbeat, job_id)
+
+    async def process(self, job_id: str):
+        job = await asyncio.to_thread(evaluation_queue.get, job_id)
+        if job is None:
+            await asyncio.to_thread(evaluation_queue.drop, job_id)
+            return
+
+        heartbeat = asyncio.ensure_future(self._heartbeat(job_id))
+        try:
+            result = await self.evaluate(job["interview_id"])
+            await asyncio.to_thread(evaluation_queue.complete, job_id, result)
+        except Exception as e:
+            print(f"Evaluation job {job_id} failed (attempt {job['attempts']}): {e}")
+            await asyncio.to_thread(evaluation_queue.fail, job_id, str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def evaluate(self, interview_id: int) -> Dict:
+        """Evaluate an interview and save the report; returns its id and score"""
+        existing = await asyncio.to_thread(self._existing, interview_id)
+        if existing is not None:
+            return existing
+
+        await self._wait_for_notes(interview_id)
+        state = await interview_graph.acollect_state(interview_id)
+        if state is None:
+            raise RuntimeError("Interview state not found")
+
+        interview, profile = await asyncio.to_thread(self._interview, interview_id)
+        # Starts from the summaries made during the interview
+        summaries = state["transcript_summaries"]
+        try:
+            evaluation_data = await evaluation_service.aevaluate_interview(
+                conversation_history=state.get("conversation_history", []),
+                evaluation_notes=state.get("evaluation_notes", []),
+                role=interview.role,
+                user_profile=profile,
+                transcript_summaries=summaries
+            )
+        finally:
+            # Summaries made before a failure are reused when the job is retried
+            await session_store.astore_summaries(interview_id, summaries)
+
+        result = await asyncio.to_thread(self._save, interview, evaluation_data)
+        interview_graph.clear(interview_id)
+        return result
+
+    async def _wait_for_notes(self, interview_id: int):
+        """Give analyses still running on the API workers time to land"""
+        answers = sum(1 for msg in await session_store.aturns(interview_id) if msg["role"] == "user")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.EVAL_JOB_NOTES_WAIT_SECONDS
+        while loop.time() < deadline:
+            if await asyncio.to_thread(session_store.note_count, interview_id) >= answers:
+                return
+            await asyncio.sleep(0.5)
+        print(f"Evaluating interview {interview_id} without all answer analyses")
+
+    def _existing(self, interview_id: int) -> Optional[Dict]:
+        db = SessionLocal()
+        try:
+            evaluation = db.query(Evaluation).filter(Evaluation.interview_id == interview_id).first()
+            return {"evaluation_id": evaluation.id, "overall_score": evaluation.overall_score} if evaluation else None
+        finally:
+            db.close()
+
+    def _interview(self, interview_id: int):
+        db = SessionLocal()
+        try:
+            interview = db.query(Interview).filter(Interview.id == interview_id).first()
+            if interview is None:
+                raise RuntimeError("Interview not found")
+            user = interview.user
+            profile = {
+                "skills": user.skills or [],
+                "experience_years": user.experience_years or 0,
+                "target_roles": user.target_roles or []
+            }
+            db.expunge(interview)
+            return interview, profile
+        finally:
+            db.close()
+
+    def _save(self, interview: Interview, evaluation_data: Dict) -> Dict:
+        db = SessionLocal()
+        try:
+            evaluation = Evaluation(
+                user_id=interview.user_id,
+                interview_id=interview.id,
+                overall_score=evaluation_data["overall_score"],
+                communication_score=evaluation_data["communication_score"],
+                technical_score=evaluation_data["technical_score"],
+                problem_solving_score=evaluation_data["problem_solving_score"],
+                confidence_score=evaluation_data["confidence_score"],
+                strengths=evaluation_data["strengths"],
+                weaknesses=evaluation_data["weaknesses"],
+                improvement_areas=evaluation_data["improvement_areas"],
+                question_feedback=evaluation_data["question_feedback"],
+                recommendations=evaluation_data["recommendations"]
+            )
+            db.add(evaluation)
+            db.commit()
+            return {"evaluation_id": evaluation.id, "overall_score": float(evaluation.overall_score)}
+        finally:
+            db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=settings.EVAL_WORKER_CONCURRENCY, help="evaluations run at once")
+    args = parser.parse_args()
+    asyncio.run(EvaluationWorker(args.concurrency).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Fill the opening-question pools offline.
+
+Generates questions for every (role, difficulty) pool until each holds
+--pool-size entries, dropping near-duplicates, so /start can serve the
+first question from Redis without an LLM call. Uses the backend's
+configured LLM and Redis; run it from the backend directory:
+
+    python -m scripts.build_question_bank --pool-size 50 --concurrency 4
+"""
+import argparse
+import asyncio
+import time
+from app.services.llm_service import llm_loop
+from app.services.question_bank import DIFFICULTIES, INTERVIEW_ROLES, question_bank
+
+
+async def build(pools, pool_size: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fill(role: str, difficulty: str):
+        async with semaphore:
+            started = time.perf_counter()
+            size = await question_bank.afill(role, difficulty, pool_size)
+            print(f"{role} / {difficulty}: {size} questions ({time.perf_counter() - started:.1f}s)")
+
+    await asyncio.gather(*[fill(role, difficulty) for role, difficulty in pools])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", nargs="+", default=INTERVIEW_ROLES, choices=INTERVIEW_ROLES)
+    parser.add_argument("--difficulties", nargs="+", default=DIFFICULTIES, choices=DIFFICULTIES)
+    parser.add_argument("--pool-size", type=int, default=question_bank.pool_size, help="questions to keep per pool")
+    parser.add_argument("--concurrency", type=int, default=4, help="pools filled at once")
+    args = parser.parse_args()
+
+    pools = [(role, difficulty) for role in args.roles for difficulty in args.difficulties]
+    llm_loop.run(build(pools, args.pool_size, args.concurrency))
+
+    stats = question_bank.stats()
+    print(f"\n{stats['duplicates_dropped']} near-duplicates dropped")
+
+
+if __name__ == "__main__":
+    main()
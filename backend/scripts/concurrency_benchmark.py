@@ -0,0 +1,143 @@
+"""Check that concurrent interviews on one worker overlap their LLM I/O.
+
+Runs one interview alone, then --sessions interviews concurrently on the
+same event loop, using InterviewGraph directly with the backend's configured
+LLM and Redis. Speculation and the question bank are off, so every turn waits
+on the LLM. If node I/O overlaps, the concurrent run takes about as long as
+the solo one. While it runs, a ticker measures event loop lag; a blocking
+call inside a node shows up there at once. Exits non-zero when the speedup
+or the lag misses its threshold, so the script can gate a CI job.
+
+    python -m scripts.concurrency_benchmark --sessions 20 --turns 3
+
+Point the backend at scripts/fake_inference_server.py for runs that need
+no network (LLM_BACKEND=remote, LLM_API_BASE_URL=...).
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List
+from app.agents.interview_graph import InterviewGraph, InterviewState
+from app.config import get_settings
+
+settings = get_settings()
+
+ANSWERS = [
+    "In my last role I led the migration of our billing service to an event-driven design, which cut p95 latency by 40%.",
+    "I usually start by reproducing the issue, then bisect recent changes and add a regression test before fixing it.",
+    "We disagreed on the API design, so I wrote up both options with trade-offs and we settled it in a short review."
+]
+
+
+def initial_state(interview_id: int, turns: int) -> InterviewState:
+    return InterviewState(
+        interview_id=interview_id,
+        role="Software Engineer",
+        difficulty="medium",
+        user_profile={"skills": ["Python", "SQL"], "experience_years": 4, "target_roles": ["Software Engineer"], "education": {}},
+        recent_history=[],
+        current_question="",
+        question_count=0,
+        # One more than the turns, so no answer ends the interview early
+        max_questions=turns + 1,
+        thinking_process="",
+        user_response="",
+        should_end=False,
+        transcript_summaries={}
+    )
+
+
+async def session(graph: InterviewGraph, interview_id: int, turns: int) -> float:
+    """Run one interview to the end of its last answer; returns its duration"""
+    started = time.perf_counter()
+    await graph.start(initial_state(interview_id, turns))
+    for _ in range(turns):
+        await graph.respond(interview_id, {"role": "user", "content": random.choice(ANSWERS)})
+    await graph.acollect_state(interview_id)
+    elapsed = time.perf_counter() - started
+    graph.clear(interview_id)
+    return elapsed
+
+
+async def measure(graph: InterviewGraph, sessions: int, turns: int) -> Dict:
+    """Run `sessions` interviews at once, tracking the worst event loop lag"""
+    lags: List[float] = []
+    running = True
+
+    async def ticker(interval: float = 0.01):
+        while running:
+            before = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - before - interval)
+
+    tick = asyncio.ensure_future(ticker())
+    base = random.randint(10**8, 10**9)
+    started = time.perf_counter()
+    durations = await asyncio.gather(*[session(graph, base + i, turns) for i in range(sessions)])
+    wall = time.perf_counter() - started
+    running = False
+    await tick
+
+    return {
+        "sessions": sessions,
+        "wall_s": round(wall, 3),
+        "mean_session_s": round(sum(durations) / len(durations), 3),
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 1)
+    }
+
+
+async def run(sessions: int, turns: int) -> Dict:
+    graph = InterviewGraph(speculative_questions=False, use_question_bank=False)
+    # Warm up connections and the backend before timing
+    await measure(graph, 1, 1)
+    solo = await measure(graph, 1, turns)
+    concurrent = await measure(graph, sessions, turns)
+    return {
+        "turns": turns,
+        "solo": solo,
+        "concurrent": concurrent,
+        # sessions / (concurrent wall / solo wall); `sessions` means perfect overlap
+        "speedup": round(sessions * solo["wall_s"] / concurrent["wall_s"], 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="interviews run concurrently")
+    parser.add_argument("--turns", type=int, default=3, help="answers per interview")
+    parser.add_argument("--min-speedup", type=float, help="fail below this speedup (default: half of --sessions, capped by LLM_MAX_CONCURRENCY)")
+    parser.add_argument("--max-lag-ms", type=float, default=100.0, help="fail above this event loop lag")
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    # The scheduler admits at most LLM_MAX_CONCURRENCY calls at once, which bounds the overlap
+    min_speedup = args.min_speedup if args.min_speedup is not None else min(args.sessions, settings.LLM_MAX_CONCURRENCY) / 2
+    report = asyncio.run(run(args.sessions, args.turns))
+    report["thresholds"] = {"min_speedup": min_speedup, "max_lag_ms": args.max_lag_ms}
+
+    print(f"solo:       1 session  in {report['solo']['wall_s']:.2f}s")
+    print(f"concurrent: {args.sessions} sessions in {report['concurrent']['wall_s']:.2f}s "
+          f"(mean {report['concurrent']['mean_session_s']:.2f}s per session)")
+    print(f"speedup:    {report['speedup']}x (min {min_speedup}x)")
+    print(f"loop lag:   {report['concurrent']['max_loop_lag_ms']}ms max (limit {args.max_lag_ms}ms)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    if report["speedup"] < min_speedup:
+        failures.append("sessions do not overlap their I/O")
+    if report["concurrent"]["max_loop_lag_ms"] > args.max_lag_ms:
+        failures.append("event loop blocked")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Benchmark the evaluation pipeline on a fixed corpus of transcripts.
+
+Runs EvaluationService over every golden transcript (2 to 30 turns) against
+scripts/fake_inference_server.py, started on --port with fixed latencies
+and seed so repeated runs make the same calls with the same outputs. For
+each transcript it records wall time, per-stage wall time, LLM calls,
+prompt and completion tokens, and peak Python memory (tracemalloc).
+The LLM cache and the action plan cache are off, so every run does the
+full work.
+
+    python -m scripts.evaluation_benchmark --output /tmp/eval_bench.json
+    python -m scripts.evaluation_benchmark --baseline scripts/benchmark_data/evaluation_baseline.json
+
+With --baseline, each metric is compared with the saved run and the
+script exits non-zero when one grew by more than --tolerance (timings
+also by more than --min-delta-ms). Save a new
+baseline by writing --output over the old one. --write-corpus regenerates
+the golden transcripts from their seed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+import httpx
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_data")
+CORPUS_PATH = os.path.join(DATA_DIR, "golden_transcripts.json")
+CORPUS_TURNS = [2, 4, 6, 10, 15, 20, 25, 30]
+
+# Metrics compared against the baseline; all of them are lower-is-better
+COMPARED = ["wall_ms", "llm_calls", "prompt_tokens", "completion_tokens", "peak_memory_kb"]
+
+QUESTIONS = [
+    "Can you walk me through a system you designed end to end?",
+    "Tell me about a production incident you handled.",
+    "How do you keep code quality high on a busy team?",
+    "Describe a time you disagreed with a teammate and how it was resolved.",
+    "How would you design a rate limiter for a public API?",
+    "What is your approach to testing a new feature?",
+    "Tell me about a performance problem you solved.",
+    "How do you prioritise when everything is urgent?",
+    "How would you scale a read-heavy service?",
+    "What would you do differently on your last project?"
+]
+
+ANSWER_PARTS = [
+    "In my last role I owned the billing service, which handled around two million events a day.",
+    "We moved it to an event-driven design with a queue in front of the writers.",
+    "The main trade-off was eventual consistency, so we added idempotency keys and a reconciliation job.",
+    "I started by reproducing the issue in staging and then bisected the recent deploys.",
+    "It turned out to be a connection pool that was too small for the new traffic pattern.",
+    "I wrote up both options with their costs and we settled it in a short design review.",
+    "We added load tests to CI so the regression could not come back unnoticed.",
+    "Looking back, I would have involved the on-call team earlier in the rollout.",
+    "I usually begin with the user-facing contract and work backwards to the data model.",
+    "For caching we used a write-through layer with short TTLs and explicit invalidation.",
+    "I measured p95 latency before and after, and it dropped by roughly forty percent.",
+    "I am less experienced with Kubernetes internals, but I have run services on it for two years."
+]
+
+NOTE_TEXTS = [
+    "Relevant and structured answer with a concrete example; could go deeper on trade-offs.",
+    "Clear communication but light on technical detail.",
+    "Strong problem-solving approach, measured results, confident delivery.",
+    "Answer drifted from the question and lacked specifics."
+]
+
+
+def build_corpus(seed: int = 7) -> List[Dict]:
+    """Synthetic transcripts with per-answer notes, one per entry of CORPUS_TURNS"""
+    rng = random.Random(seed)
+    corpus = []
+    for turns in CORPUS_TURNS:
+        history, notes = [], []
+        for _ in range(turns):
+            question = rng.choice(QUESTIONS)
+            answer = " ".join(rng.sample(ANSWER_PARTS, rng.randint(2, 6)))
+            history += [{"role": "interviewer", "content": question}, {"role": "user", "content": answer}]
+            notes.append({
+                "question": question,
+                "response": answer,
+                "evaluation": rng.choice(NOTE_TEXTS),
+                "scores": {
+                    name: float(rng.randint(50, 95))
+                    for name in ("communication", "technical", "problem_solving", "confidence")
+                }
+            })
+        corpus.append({
+            "name": f"turns_{turns:02d}",
+            "role": "Software Engineer",
+            "user_profile": {"skills": ["Python", "SQL", "AWS"], "experience_years": 4, "target_roles": ["Software Engineer"]},
+            "conversation_history": history,
+            "evaluation_notes": notes
+        })
+    return corpus
+
+
+def start_fake_server(port: int, ttft_ms: float, tokens_per_second: float) -> subprocess.Popen:
+    server = subprocess.Popen([
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_inference_server.py"),
+        "--port", str(port), "--ttft-ms", str(ttft_ms), "--tokens-per-second", str(tokens_per_second),
+        "--ttft-sigma", "0", "--tps-sigma", "0", "--seed", "0"
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1.0)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"Fake inference server did not start on port {port}")
+
+
+def run_transcript(transcript: Dict, repeat: int) -> Dict:
+    """Evaluate one transcript `repeat` times; timings are medians"""
+    from app.services.evaluation_service import evaluation_service
+    from app.services.llm_metrics import llm_metrics
+    from app.services.llm_service import llm_loop
+
+    walls, stages, peaks = [], [], []
+    for _ in range(repeat):
+        llm_metrics.reset()
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = llm_loop.run(evaluation_service.aevaluate_interview(
+            conversation_history=transcript["conversation_history"],
+            evaluation_notes=transcript["evaluation_notes"],
+            role=transcript["role"],
+            user_profile=transcript["user_profile"],
+            transcript_summaries={}
+        ))
+        walls.append((time.perf_counter() - started) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+        stages.append(result["stage_timings_ms"])
+
+    call_sites = llm_metrics.snapshot()
+    return {
+        "turns": len(transcript["evaluation_notes"]),
+        "wall_ms": round(statistics.median(walls), 1),
+        "stages_ms": {name: round(statistics.median(run[name] for run in stages), 1) for name in stages[0]},
+        "llm_calls": sum(site["calls"] for site in call_sites.values()),
+        "prompt_tokens": sum(site["prompt_tokens"] for site in call_sites.values()),
+        "completion_tokens": sum(site["completion_tokens"] for site in call_sites.values()),
+        "calls_by_site": {name: site["calls"] for name, site in call_sites.items()},
+        "peak_memory_kb": round(max(peaks), 1)
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Print each metric against the baseline; returns the regressions"""
+    regressions = []
+    if baseline.get("config") != results["config"]:
+        print("Warning: baseline was recorded with a different configuration or corpus")
+
+    for name, current in results["transcripts"].items():
+        previous = baseline["transcripts"].get(name)
+        if previous is None:
+            print(f"{name}: not in baseline")
+            continue
+        metrics = [(metric, previous[metric], current[metric]) for metric in COMPARED]
+        metrics += [
+            (f"stage {stage}", previous["stages_ms"].get(stage), ms)
+            for stage, ms in current["stages_ms"].items()
+        ]
+        for metric, old, new in metrics:
+            if not old:
+                continue
+            change = (new - old) / old
+            # Short stages jitter by tens of ms; calls, tokens and memory do not
+            timing = metric == "wall_ms" or metric.startswith("stage ")
+            flag = ""
+            if change > tolerance and (not timing or new - old > min_delta_ms):
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}")
+            print(f"{name:10} {metric:32} {old:>12} -> {new:>12} ({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed growth per metric before it counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=50.0, help="timing growth below this is treated as noise")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per transcript; timings are medians")
+    parser.add_argument("--port", type=int, default=8765, help="port for the fake inference server")
+    parser.add_argument("--ttft-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--write-corpus", action="store_true", help="regenerate the golden transcripts and exit")
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        os.makedirs(os.path.dirname(args.corpus), exist_ok=True)
+        with open(args.corpus, "w") as f:
+            json.dump(build_corpus(), f, indent=1)
+        print(f"Wrote {len(CORPUS_TURNS)} transcripts to {args.corpus}")
+        return
+
+    with open(args.corpus, "rb") as f:
+        raw = f.read()
+    corpus = json.loads(raw)
+
+    # Settings are read on first import, so the backend is configured before any app module loads
+    os.environ.update(
+        LLM_BACKEND="remote",
+        LLM_API_BASE_URL=f"http://127.0.0.1:{args.port}",
+        LLM_CACHE_ENABLED="false",
+        ACTION_PLAN_CACHE_ENABLED="false"
+    )
+    from app.config import get_settings
+    settings = get_settings()
+
+    server = start_fake_server(args.port, args.ttft_ms, args.tokens_per_second)
+    try:
+        results = {
+            "config": {
+                "corpus_sha256": hashlib.sha256(raw).hexdigest()[:16],
+                "eval_mode": settings.EVAL_MODE,
+                "ttft_ms": args.ttft_ms,
+                "tokens_per_second": args.tokens_per_second,
+                "repeat": args.repeat
+            },
+            "transcripts": {}
+        }
+        # One unmeasured run loads the tokenizer and opens the connections
+        run_transcript(corpus[0], 1)
+        for transcript in corpus:
+            stats = run_transcript(transcript, args.repeat)
+            results["transcripts"][transcript["name"]] = stats
+            print(f"{transcript['name']}: {stats['wall_ms']} ms, {stats['llm_calls']} calls, "
+                  f"{stats['prompt_tokens']}+{stats['completion_tokens']} tokens, {stats['peak_memory_kb']} KB peak")
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
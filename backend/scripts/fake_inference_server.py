@@ -0,0 +1,236 @@
+"""Stand-in for the Hugging Face inference API, for benchmarks and load tests.
+
+Speaks the same HTTP API as the remote backend (JSON, batched inputs and SSE
+streaming) and answers with deterministic canned text in the formats the
+interview graph and evaluation parsers expect. Latency is time-to-first-token
+plus one delay per generated token, both drawn from configurable lognormal
+distributions.
+
+    python scripts/fake_inference_server.py --port 8080 --ttft-ms 300 --tokens-per-second 40
+
+Point the backend at it with LLM_BACKEND=remote and
+LLM_API_BASE_URL=http://localhost:8080.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from typing import Dict, List, Union
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+import uvicorn
+
+app = FastAPI(title="Fake inference server")
+
+config = {
+    "ttft_ms": 250.0,
+    "ttft_sigma": 0.3,
+    "tokens_per_second": 50.0,
+    "tps_sigma": 0.2,
+    "cold_start_seconds": 0.0,
+    "error_rate": 0.0,
+    "seed": 0
+}
+STRENGTHS = [
+    "Clear and structured answers",
+    "Solid grasp of core concepts",
+    "Good use of concrete examples",
+    "Calm and confident delivery",
+    "Thoughtful trade-off analysis"
+]
+WEAKNESSES = [
+    "Limited depth on system design",
+    "Answers occasionally too long",
+    "Few metrics to quantify impact",
+    "Hesitant on technical follow-ups",
+    "Testing strategy not discussed"
+]
+stats = {"requests": 0, "prompts": 0, "tokens": 0, "errors": 0, "cold_start_rejections": 0}
+started_at = time.monotonic()
+
+
+class GenerateRequest(BaseModel):
+    inputs: Union[str, List[str]]
+    parameters: Dict = {}
+    options: Dict = {}
+    stream: bool = False
+
+
+def _rng(prompt: str) -> random.Random:
+    """Per-prompt RNG, so the same prompt always gets the same answer"""
+    digest = hashlib.sha256(f"{config['seed']}:{prompt}".encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _canned_output(prompt: str) -> str:
+    """Pick a reply in the format the calling prompt asks for"""
+    rng = _rng(prompt)
+
+    if "Return a single JSON object with exactly these fields" in prompt:
+        weaknesses = rng.sample(WEAKNESSES, 3)
+        return json.dumps({
+            "communication_score": rng.randint(55, 95),
+            "technical_score": rng.randint(55, 95),
+            "problem_solving_score": rng.randint(55, 95),
+            # Now and then out of range, so the repair path gets exercised
+            "confidence_score": rng.randint(55, 95) if rng.random() > 0.2 else 120,
+            "strengths": rng.sample(STRENGTHS, 3),
+            "weaknesses": weaknesses,
+            "improvement_areas": [
+                {"area": weakness, "action_plan": "Practice two mock answers per week on this topic and reassess after four weeks.", "priority": "medium"}
+                for weakness in weaknesses
+            ],
+            "recommendations": "Focus on system design practice, prepare quantified project stories, and schedule weekly mock interviews."
+        })
+    if "Field to fix: " in prompt:
+        name = prompt.split("Field to fix: ", 1)[1].split()[0]
+        return json.dumps({name: rng.randint(55, 95) if name.endswith("_score") else "Keep practising with weekly mock interviews."})
+    if "Provide scores in this exact format" in prompt:
+        return "\n".join(
+            f"{name}: {rng.randint(55, 95)}"
+            for name in ("Communication", "Technical", "Problem Solving", "Confidence")
+        )
+    if "STRENGTHS:" in prompt:
+        strengths = rng.sample(STRENGTHS, 3)
+        weaknesses = rng.sample(WEAKNESSES, 3)
+        return "STRENGTHS:\n" + "\n".join(f"- {s}" for s in strengths) + "\n\nWEAKNESSES:\n" + "\n".join(f"- {w}" for w in weaknesses)
+    if "Summarize this part of an interview" in prompt:
+        return "The candidate covered their recent projects and core technical skills, giving mostly clear answers with some gaps in depth."
+    if "opening interview questions" in prompt:
+        topics = [
+            ("a system you designed end to end", "system design"), ("a production incident you handled", "debugging"),
+            ("how you keep code quality high", "testing"), ("a time you disagreed with a teammate", "communication"),
+            ("a project you are proud of", "ownership"), ("how you approach a new codebase", "learning"),
+            ("a performance problem you solved", "performance"), ("how you prioritise competing work", "prioritisation"),
+            ("a decision you made with incomplete data", "judgement"), ("how you mentor others", "leadership"),
+            ("a migration you planned", "planning"), ("how you handle unclear requirements", "problem solving")
+        ]
+        return "\n".join(f"Can you tell me about {topic}? | {skill}" for topic, skill in rng.sample(topics, 10))
+    if "Generate the next interview question" in prompt:
+        topic = rng.choice(["a challenging bug you fixed", "a system you designed", "a conflict within your team", "how you test your code", "a project you are proud of"])
+        return f"Can you walk me through {topic}, and what you would do differently today?"
+    if "Analyze this interview response" in prompt:
+        return "The response is relevant and reasonably clear. It shows working knowledge but would benefit from a concrete example and more technical depth.\n" + "\n".join(
+            f"{name}: {rng.randint(55, 95)}"
+            for name in ("Communication", "Technical", "Problem Solving", "Confidence")
+        )
+    if "brief acknowledgment" in prompt:
+        return rng.choice(["Thanks, that's helpful context.", "Got it, thank you for the detail.", "Interesting, thanks for sharing that."])
+    if "Specific action items" in prompt:
+        return "1. Practice two mock answers per week on this topic.\n2. Review one reference book chapter and summarize it.\n3. Reassess after four weeks."
+    if "comprehensive evaluation" in prompt:
+        return (
+            "Overall the candidate performed solidly. Communication was clear and well structured. "
+            "Technical knowledge was adequate with room for more depth. Problem-solving was methodical. "
+            "Confidence was good throughout. Key strengths are clarity and examples; the main area for "
+            "improvement is depth on design questions."
+        )
+    if "Recommendations:" in prompt:
+        return "Focus on system design practice, prepare quantified project stories, and schedule weekly mock interviews for the next month."
+    return "This is a canned response from the fake inference server."
+
+
+def _tokens(text: str, max_new_tokens: int) -> List[str]:
+    """Split text into word tokens, capped at max_new_tokens"""
+    words = text.split(" ")
+    tokens = [words[0]] + [f" {word}" for word in words[1:]]
+    return tokens[:max_new_tokens]
+
+
+def _delays():
+    """Time to first token and the per-token delay, both in seconds"""
+    ttft = random.lognormvariate(math.log(config["ttft_ms"] / 1000), config["ttft_sigma"]) if config["ttft_ms"] > 0 else 0.0
+    tps = random.lognormvariate(math.log(config["tokens_per_second"]), config["tps_sigma"]) if config["tokens_per_second"] > 0 else 0.0
+    return ttft, (1 / tps if tps else 0.0)
+
+
+def _unavailable(options: Dict):
+    """Error response to return instead of generating, if any"""
+    remaining = config["cold_start_seconds"] - (time.monotonic() - started_at)
+    if remaining > 0 and not options.get("wait_for_model"):
+        stats["cold_start_rejections"] += 1
+        return JSONResponse(status_code=503, content={"error": "Model is currently loading", "estimated_time": remaining})
+    if config["error_rate"] and random.random() < config["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse(status_code=500, content={"error": "Injected failure"})
+    return None
+
+
+@app.post("/models/{model_id:path}")
+async def generate(model_id: str, request: GenerateRequest):
+    stats["requests"] += 1
+    error = _unavailable(request.options)
+    if error is not None:
+        return error
+
+    remaining = config["cold_start_seconds"] - (time.monotonic() - started_at)
+    if remaining > 0:
+        await asyncio.sleep(remaining)
+
+    max_new_tokens = request.parameters.get("max_new_tokens", 256)
+    prompts = request.inputs if isinstance(request.inputs, list) else [request.inputs]
+    outputs = [_tokens(_canned_output(prompt), max_new_tokens) for prompt in prompts]
+    stats["prompts"] += len(prompts)
+    stats["tokens"] += sum(len(tokens) for tokens in outputs)
+
+    ttft, per_token = _delays()
+
+    if request.stream and not isinstance(request.inputs, list):
+        return StreamingResponse(_stream(outputs[0], ttft, per_token), media_type="text/event-stream")
+
+    # A batch decodes in lockstep, so it takes as long as its longest output
+    await asyncio.sleep(ttft + per_token * max(len(tokens) for tokens in outputs))
+    if isinstance(request.inputs, list):
+        return [[{"generated_text": "".join(tokens)}] for tokens in outputs]
+    return [{"generated_text": "".join(outputs[0])}]
+
+
+async def _stream(tokens: List[str], ttft: float, per_token: float):
+    await asyncio.sleep(ttft)
+    for i, token in enumerate(tokens):
+        if i:
+            await asyncio.sleep(per_token)
+        last = i == len(tokens) - 1
+        event = {
+            "token": {"id": i, "text": token, "special": False},
+            "generated_text": "".join(tokens) if last else None
+        }
+        yield f"data: {json.dumps(event)}\n\n"
+
+
+@app.get("/stats")
+def get_stats():
+    return {**stats, "config": config}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttft-ms", type=float, default=config["ttft_ms"], help="median time to first token")
+    parser.add_argument("--ttft-sigma", type=float, default=config["ttft_sigma"], help="lognormal sigma of the time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=config["tokens_per_second"], help="median decode rate; 0 for instant")
+    parser.add_argument("--tps-sigma", type=float, default=config["tps_sigma"], help="lognormal sigma of the decode rate")
+    parser.add_argument("--cold-start-seconds", type=float, default=config["cold_start_seconds"], help="answer 503 loading for this long after startup")
+    parser.add_argument("--error-rate", type=float, default=config["error_rate"], help="fraction of requests failing with 500")
+    parser.add_argument("--seed", type=int, default=config["seed"], help="varies the canned outputs")
+    args = parser.parse_args()
+
+    config.update(
+        ttft_ms=args.ttft_ms,
+        ttft_sigma=args.ttft_sigma,
+        tokens_per_second=args.tokens_per_second,
+        tps_sigma=args.tps_sigma,
+        cold_start_seconds=args.cold_start_seconds,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""End-to-end interview load test.
+
+Simulates concurrent candidates against a running backend. Each one
+registers, then goes through /interviews/create, /start, a number of
+/respond turns and /complete, then polls its evaluation job until the
+report is ready. Reports throughput and latency percentiles per endpoint;
+"evaluation" is the time from /complete to a finished evaluation.
+
+    python scripts/load_test.py --base-url http://localhost:8000 --candidates 50 --concurrency 10 --turns 3
+
+For runs without the network, start scripts/fake_inference_server.py and
+point the backend at it (LLM_BACKEND=remote, LLM_API_BASE_URL=...).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+import httpx
+
+ANSWERS = [
+    "In my last role I led the migration of our billing service to an event-driven design, which cut p95 latency by 40%.",
+    "I usually start by reproducing the issue, then bisect recent changes and add a regression test before fixing it.",
+    "We disagreed on the API design, so I wrote up both options with trade-offs and we settled it in a short review.",
+    "I prefer small, well-tested increments and rely on code review and CI to catch regressions early."
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class LoadTest:
+    def __init__(self, base_url: str, turns: int, think_time: float, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.turns = turns
+        self.think_time = think_time
+        self.timeout = timeout
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.completed = 0
+        self.failed = 0
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, path: str, **kwargs) -> Optional[Dict]:
+        """Time one request; returns its JSON body, or None on failure"""
+        started = time.perf_counter()
+        try:
+            resp = await client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[f"{name}: {type(e).__name__}"] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+
+        if resp.status_code >= 400:
+            self.errors[f"{name}: HTTP {resp.status_code}"] += 1
+            return None
+        return resp.json()
+
+    async def candidate(self, client: httpx.AsyncClient):
+        """Run one candidate through a full interview"""
+        uid = uuid.uuid4().hex[:12]
+        token = await self.call(client, "register", "POST", "/auth/register", json={
+            "email": f"load-{uid}@example.com",
+            "phone": f"+1555{int(uid, 16) % 10**7:07d}",
+            "full_name": f"Load Test {uid}",
+            "password": "load-test-password"
+        })
+        if token is None:
+            self.failed += 1
+            return
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+        interview = await self.call(client, "create", "POST", "/interviews/create", headers=headers, json={
+            "role": "Software Engineer",
+            "difficulty": "medium"
+        })
+        if interview is None:
+            self.failed += 1
+            return
+        interview_id = interview["id"]
+
+        if await self.call(client, "start", "POST", f"/interviews/{interview_id}/start", headers=headers) is None:
+            self.failed += 1
+            return
+
+        for _ in range(self.turns):
+            await asyncio.sleep(self.think_time)
+            result = await self.call(client, "respond", "POST", f"/interviews/{interview_id}/respond", headers=headers, json={
+                "message": random.choice(ANSWERS)
+            })
+            if result is None:
+                self.failed += 1
+                return
+            if "job_id" in result:
+                # The interview reached max_questions and completed itself
+                break
+        else:
+            result = await self.call(client, "complete", "POST", f"/interviews/{interview_id}/complete", headers=headers)
+            if result is None:
+                self.failed += 1
+                return
+
+        if await self.wait_for_evaluation(client, headers, result["job_id"]):
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    async def wait_for_evaluation(self, client: httpx.AsyncClient, headers: Dict, job_id: str) -> bool:
+        """Poll an evaluation job until it finishes; True if it completed"""
+        started = time.perf_counter()
+        while time.perf_counter() - started < self.timeout:
+            try:
+                resp = await client.get(f"/interviews/evaluation-jobs/{job_id}", headers=headers)
+            except httpx.HTTPError as e:
+                self.errors[f"evaluation: {type(e).__name__}"] += 1
+                return False
+            status = resp.json().get("status") if resp.status_code == 200 else None
+            if status == "completed":
+                self.latencies["evaluation"].append(time.perf_counter() - started)
+                return True
+            if status in (None, "failed"):
+                self.errors[f"evaluation: {status or f'HTTP {resp.status_code}'}"] += 1
+                return False
+            await asyncio.sleep(0.5)
+        self.errors["evaluation: timeout"] += 1
+        return False
+
+    async def run(self, candidates: int, concurrency: int) -> Dict:
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            async def bounded():
+                async with semaphore:
+                    await self.candidate(client)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[bounded() for _ in range(candidates)])
+            elapsed = time.perf_counter() - started
+
+        return self.report(candidates, concurrency, elapsed)
+
+    def report(self, candidates: int, concurrency: int, elapsed: float) -> Dict:
+        requests = sum(len(values) for values in self.latencies.values())
+        return {
+            "candidates": candidates,
+            "concurrency": concurrency,
+            "turns": self.turns,
+            "elapsed_s": round(elapsed, 3),
+            "completed": self.completed,
+            "failed": self.failed,
+            "interviews_per_min": round(self.completed / elapsed * 60, 2) if elapsed else 0.0,
+            "requests_per_s": round(requests / elapsed, 2) if elapsed else 0.0,
+            "endpoints": {
+                name: {
+                    "count": len(values),
+                    "mean_ms": round(sum(values) / len(values) * 1000, 1),
+                    "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+                    "p90_ms": round(percentile(values, 0.90) * 1000, 1),
+                    "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                    "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+                    "max_ms": round(max(values) * 1000, 1)
+                }
+                for name, values in self.latencies.items()
+            },
+            "errors": dict(self.errors)
+        }
+
+
+def print_report(report: Dict):
+    print(f"\n{report['completed']}/{report['candidates']} interviews completed in {report['elapsed_s']}s "
+          f"(concurrency {report['concurrency']}, {report['turns']} turns)")
+    print(f"Throughput: {report['interviews_per_min']} interviews/min, {report['requests_per_s']} requests/s\n")
+    print(f"{'endpoint':<10} {'count':>6} {'mean':>9} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, row in report["endpoints"].items():
+        print(f"{name:<10} {row['count']:>6} " + " ".join(
+            f"{row[key]:>9.1f}" for key in ("mean_ms", "p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+        ))
+    if report["errors"]:
+        print("\nErrors:")
+        for error, count in report["errors"].items():
+            print(f"  {error}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--candidates", type=int, default=20, help="interviews to run in total")
+    parser.add_argument("--concurrency", type=int, default=5, help="candidates in flight at once")
+    parser.add_argument("--turns", type=int, default=3, help="answers per interview before /complete")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds a candidate waits before answering")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    load_test = LoadTest(args.base_url, args.turns, args.think_time, args.timeout)
+    report = asyncio.run(load_test.run(args.candidates, args.concurrency))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
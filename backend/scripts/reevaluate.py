@@ -0,0 +1,286 @@
+"""Re-evaluate completed interviews in bulk.
+
+Streams completed interviews from the database in chunks of --chunk-size
+and evaluates each chunk in one of --processes worker processes, with
+--concurrency interviews in flight per process. All LLM calls run at
+BACKFILL priority, so the scheduler (and request batching, when enabled)
+treat them as the lowest class. Evaluations are written back with one
+bulk insert/update per chunk.
+
+Progress is checkpointed to --checkpoint after every chunk. The checkpoint
+is the highest interview id below which every chunk has been written, so
+after a crash the same command picks up where it stopped; pass --restart
+to start over. Uses the backend's configured database, Redis and LLM; run
+it from the backend directory:
+
+    python -m scripts.reevaluate --processes 4 --concurrency 8 --chunk-size 50
+
+Per-answer notes are reused from each interview's current evaluation;
+--reanalyze generates them again for the question and answer each note
+recorded (needed for per-answer scores on evaluations made before they
+existed). The stored conversation only holds answers and acknowledgments,
+not the questions asked, so an interview without notes naming every
+question cannot be analyzed and fails. Interviews that fail are listed
+in the checkpoint and can be re-run with --retry-failed.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.models.interview import Evaluation, Interview
+from app.models.user import User  # registers the model behind Interview.user
+from app.utils.database import SessionLocal
+
+EVALUATION_FIELDS = [
+    "overall_score", "communication_score", "technical_score", "problem_solving_score",
+    "confidence_score", "strengths", "weaknesses", "improvement_areas",
+    "question_feedback", "recommendations"
+]
+
+
+def load_checkpoint(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {"last_interview_id": 0, "evaluated": 0, "failed": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict):
+    # Written to a temporary file first so a crash never leaves half a checkpoint
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({**checkpoint, "updated_at": datetime.utcnow().isoformat()}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def stream_chunks(after_id: int, chunk_size: int, role: Optional[str], limit: Optional[int]) -> Iterator[List[int]]:
+    """Ids of completed interviews after `after_id`, in ascending chunks (keyset paging)"""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        db = SessionLocal()
+        try:
+            query = db.query(Interview.id).filter(Interview.status == "completed", Interview.id > after_id)
+            if role:
+                query = query.filter(Interview.role == role)
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            ids = [row.id for row in query.order_by(Interview.id).limit(size)]
+        finally:
+            db.close()
+        if not ids:
+            return
+        yield ids
+        after_id = ids[-1]
+        if remaining is not None:
+            remaining -= len(ids)
+
+
+def evaluate_chunk(interview_ids: List[int], concurrency: int, reanalyze: bool) -> Dict:
+    """Evaluate one chunk in a worker process; returns the evaluations and failures"""
+    from app.services.llm_service import llm_loop
+
+    started = time.perf_counter()
+    results, failed = llm_loop.run(_evaluate_chunk(interview_ids, concurrency, reanalyze))
+    return {"evaluations": results, "failed": failed, "seconds": time.perf_counter() - started}
+
+
+async def _evaluate_chunk(interview_ids: List[int], concurrency: int, reanalyze: bool):
+    from app.services.evaluation_service import EvaluationService
+    from app.services.llm_scheduler import Priority
+
+    evaluator = EvaluationService(priority=Priority.BACKFILL)
+    semaphore = asyncio.Semaphore(concurrency)
+    interviews = await asyncio.to_thread(_load_interviews, interview_ids)
+
+    async def evaluate(interview: Dict) -> Optional[Dict]:
+        async with semaphore:
+            try:
+                notes = interview["notes"]
+                if reanalyze or not notes:
+                    notes = await _analyze_answers(notes)
+                data = await evaluator.aevaluate_interview(
+                    conversation_history=interview["conversation_history"],
+                    evaluation_notes=notes,
+                    role=interview["role"],
+                    user_profile=interview["user_profile"],
+                    # The interview's chunk summaries expired with its session
+                    transcript_summaries={}
+                )
+            except Exception as e:
+                print(f"Interview {interview['id']} failed: {e}")
+                return None
+            return {
+                "interview_id": interview["id"],
+                "user_id": interview["user_id"],
+                **{field: data[field] for field in EVALUATION_FIELDS}
+            }
+
+    results = await asyncio.gather(*[evaluate(interview) for interview in interviews])
+    evaluated = [result for result in results if result is not None]
+    failed = [interview["id"] for interview, result in zip(interviews, results) if result is None]
+    return evaluated, failed
+
+
+def _answer_pairs(notes: List[Dict]) -> List[Tuple[str, str]]:
+    """(question, answer) of every answer, from the notes made during the interview.
+
+    The interviewer messages in the conversation are acknowledgments, not
+    the questions that were asked, so the notes are the only record of
+    which question each answer was given to.
+    """
+    pairs = [((note.get("question") or "").strip(), (note.get("response") or "").strip()) for note in notes]
+    if not pairs or not all(question and answer for question, answer in pairs):
+        raise ValueError("stored notes do not record the question of every answer")
+    return pairs
+
+
+async def _analyze_answers(notes: List[Dict]) -> List[Dict]:
+    """Fresh evaluation notes for every answer the stored notes recorded"""
+    from app.agents.interview_graph import interview_graph
+    from app.services.llm_scheduler import Priority
+
+    return list(await asyncio.gather(*[
+        interview_graph._analyze(question, answer, Priority.BACKFILL) for question, answer in _answer_pairs(notes)
+    ]))
+
+
+def _load_interviews(interview_ids: List[int]) -> List[Dict]:
+    db = SessionLocal()
+    try:
+        interviews = db.query(Interview).filter(Interview.id.in_(interview_ids)).order_by(Interview.id).all()
+        notes = {
+            evaluation.interview_id: evaluation.question_feedback or []
+            for evaluation in db.query(Evaluation).filter(Evaluation.interview_id.in_(interview_ids))
+        }
+        return [
+            {
+                "id": interview.id,
+                "user_id": interview.user_id,
+                "role": interview.role,
+                "conversation_history": interview.conversation_history or [],
+                "notes": notes.get(interview.id, []),
+                "user_profile": {
+                    "skills": interview.user.skills or [],
+                    "experience_years": interview.user.experience_years or 0,
+                    "target_roles": interview.user.target_roles or []
+                }
+            }
+            for interview in interviews if interview.conversation_history
+        ]
+    finally:
+        db.close()
+
+
+def upsert_evaluations(evaluations: List[Dict]):
+    """Update existing evaluations and insert missing ones, one bulk statement each"""
+    if not evaluations:
+        return
+    db = SessionLocal()
+    try:
+        existing = dict(
+            db.query(Evaluation.interview_id, Evaluation.id)
+            .filter(Evaluation.interview_id.in_([evaluation["interview_id"] for evaluation in evaluations]))
+        )
+        updates = [{"id": existing[e["interview_id"]], **e} for e in evaluations if e["interview_id"] in existing]
+        inserts = [e for e in evaluations if e["interview_id"] not in existing]
+        if updates:
+            db.bulk_update_mappings(Evaluation, updates)
+        if inserts:
+            db.bulk_insert_mappings(Evaluation, inserts)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(args) -> Dict:
+    checkpoint = {"last_interview_id": 0, "evaluated": 0, "failed": []} if args.restart else load_checkpoint(args.checkpoint)
+    if checkpoint["last_interview_id"]:
+        print(f"Resuming after interview {checkpoint['last_interview_id']} ({checkpoint['evaluated']} evaluated so far)")
+
+    if args.retry_failed:
+        failed_ids = checkpoint["failed"]
+        chunks = iter([failed_ids[i:i + args.chunk_size] for i in range(0, len(failed_ids), args.chunk_size)])
+    else:
+        chunks = stream_chunks(checkpoint["last_interview_id"], args.chunk_size, args.role, args.limit)
+    # Chunks in dispatch order; the checkpoint only moves past a chunk once
+    # it and every chunk before it are written
+    in_flight: Dict = {}
+    order: List = []
+    done: Dict = {}
+    evaluated = failed = 0
+    started = time.perf_counter()
+
+    # Spawned, not forked: the parent already runs the LLM and database threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.processes, mp_context=context) as pool:
+        while True:
+            while len(in_flight) < args.processes * 2:
+                ids = next(chunks, None)
+                if ids is None:
+                    break
+                future = pool.submit(evaluate_chunk, ids, args.concurrency, args.reanalyze)
+                in_flight[future] = ids
+                order.append(future)
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                ids = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Chunk {ids[0]}-{ids[-1]} failed: {e}")
+                    result = {"evaluations": [], "failed": ids, "seconds": 0.0}
+                upsert_evaluations(result["evaluations"])
+                done[future] = ids
+                evaluated += len(result["evaluations"])
+                failed += len(result["failed"])
+                succeeded = {evaluation["interview_id"] for evaluation in result["evaluations"]}
+                checkpoint["failed"] = sorted((set(checkpoint["failed"]) | set(result["failed"])) - succeeded)
+                checkpoint["evaluated"] += len(result["evaluations"])
+
+                elapsed = time.perf_counter() - started
+                print(f"Interviews {ids[0]}-{ids[-1]}: {len(result['evaluations'])} evaluated, "
+                      f"{len(result['failed'])} failed in {result['seconds']:.1f}s "
+                      f"({evaluated / elapsed * 60:.1f} interviews/min overall)")
+
+            while order and order[0] in done:
+                last_id = done.pop(order.pop(0))[-1]
+                if not args.retry_failed:
+                    checkpoint["last_interview_id"] = last_id
+            save_checkpoint(args.checkpoint, checkpoint)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "evaluated": evaluated,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 1),
+        "interviews_per_min": round(evaluated / elapsed * 60, 2) if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2, help="worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="interviews evaluated at once per process")
+    parser.add_argument("--chunk-size", type=int, default=50, help="interviews per chunk and per bulk write")
+    parser.add_argument("--role", help="only re-evaluate interviews for this role")
+    parser.add_argument("--limit", type=int, help="stop after this many interviews")
+    parser.add_argument("--reanalyze", action="store_true", help="regenerate per-answer notes instead of reusing them")
+    parser.add_argument("--checkpoint", default="reevaluation_checkpoint.json", help="progress file used to resume")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first interview")
+    parser.add_argument("--retry-failed", action="store_true", help="only re-evaluate the interviews the checkpoint lists as failed")
+    args = parser.parse_args()
+
+    report = run(args)
+    print(f"\n{report['evaluated']} interviews re-evaluated, {report['failed']} failed, "
+          f"in {report['elapsed_s']}s ({report['interviews_per_min']} interviews/min)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+
+# Settings are read on first import, so tests never touch a real database or LLM
+os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/interview_tests.db")
+os.environ.setdefault("LLM_BACKEND", "mock")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
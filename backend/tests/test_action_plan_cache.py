@@ -0,0 +1,40 @@
+import asyncio
+from app.config import get_settings
+from app.services import evaluation_service as evaluation_module
+from app.services.action_plan_cache import ActionPlanCache
+from app.services.evaluation_service import EvaluationService
+
+
+def test_store_ignores_empty_plans():
+    cache = ActionPlanCache(max_entries=4, threshold=0.9, policy="lru")
+    cache.store("Software Engineer", "Lack of concrete examples", "")
+    cache.store("Software Engineer", "Lack of concrete examples", "  \n")
+
+    assert cache.lookup("Software Engineer", "Lack of concrete examples") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_failed_generation_is_not_cached(monkeypatch):
+    cache = ActionPlanCache(max_entries=4, threshold=0.9, policy="lru")
+    monkeypatch.setattr(evaluation_module, "action_plan_cache", cache)
+    monkeypatch.setattr(get_settings(), "ACTION_PLAN_CACHE_ENABLED", True)
+
+    plans = iter(["", "Practice STAR answers weekly."])
+
+    async def agenerate(**kwargs):
+        return next(plans)
+
+    monkeypatch.setattr(evaluation_module.llm_service, "agenerate", agenerate)
+
+    def improvement_areas():
+        return asyncio.run(EvaluationService()._generate_improvement_areas(
+            ["Lack of concrete examples"], "Software Engineer", {}, asyncio.Semaphore(1)
+        ))
+
+    # The backend failed: the empty plan is returned once but not cached
+    assert improvement_areas()[0]["action_plan"] == ""
+    assert cache.stats()["entries"] == 0
+
+    # So the next candidate gets a fresh plan, which is cached
+    assert improvement_areas()[0]["action_plan"] == "Practice STAR answers weekly."
+    assert cache.lookup("Software Engineer", "Lack of concrete examples") == "Practice STAR answers weekly."
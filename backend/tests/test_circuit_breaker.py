@@ -0,0 +1,97 @@
+import asyncio
+import httpx
+import pytest
+from app.services.llm_resilience import CircuitBreaker, CircuitOpenError
+from app.services.llm_service import HuggingFaceLLMService
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://llm.test")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def half_open_service() -> HuggingFaceLLMService:
+    """A service whose circuit is open and due for a probe"""
+    service = HuggingFaceLLMService(api_url="http://127.0.0.1:1/models/test")
+    service._breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    service._breaker.record_failure()
+    service._breaker.opened_at -= 60.0
+    return service
+
+
+def test_probe_with_non_transient_error_closes_the_circuit(monkeypatch):
+    service = half_open_service()
+
+    async def post_single(prompt, max_new_tokens=None, temperature=None):
+        raise status_error(400)
+
+    monkeypatch.setattr(service, "_post_single", post_single)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(service._agenerate("Hello"))
+
+    # The endpoint answered, so later calls go through instead of failing fast
+    assert service._breaker.state == "closed"
+    assert service._breaker.allow()
+
+
+def test_probe_with_transient_error_reopens_the_circuit(monkeypatch):
+    service = half_open_service()
+
+    async def post_single(prompt, max_new_tokens=None, temperature=None):
+        raise status_error(503)
+
+    monkeypatch.setattr(service, "_post_single", post_single)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(service._agenerate("Hello"))
+
+    assert service._breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(service._agenerate("Hello"))
+
+
+def test_cancelled_probe_lets_the_next_call_probe(monkeypatch):
+    service = half_open_service()
+    calls = []
+
+    async def post_single(prompt, max_new_tokens=None, temperature=None):
+        calls.append(prompt)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return "answer"
+
+    monkeypatch.setattr(service, "_post_single", post_single)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(service._agenerate("Hello"), timeout=0.05))
+    assert service._breaker.state == "open"
+
+    assert asyncio.run(service._agenerate("Hello")) == "answer"
+    assert service._breaker.state == "closed"
+
+
+def test_abandoned_stream_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.opened_at -= 60.0
+    assert breaker.allow() and breaker.state == "half_open"
+
+    # A consumer that stops reading closes the generator with GeneratorExit
+    with pytest.raises(GeneratorExit):
+        with breaker.guard():
+            raise GeneratorExit()
+
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+
+def test_lost_probe_times_out():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0, probe_timeout=60.0)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == "half_open"
+
+    # The probe never reports back: further calls wait until it times out
+    assert not breaker.allow()
+    breaker.probe_started_at -= 60.0
+    assert breaker.allow() and breaker.state == "half_open"
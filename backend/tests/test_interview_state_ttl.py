@@ -0,0 +1,42 @@
+import asyncio
+import fakeredis
+from app.agents.interview_graph import interview_graph
+from app.agents.session_store import session_store
+from app.utils.redis_client import redis_client
+
+JOB_TTL = 86400
+
+
+def test_retained_state_outlives_the_interview_ttl(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_client, "client", client)
+
+    async def run():
+        await session_store.append_turns(7, [{"role": "user", "content": "An answer."}])
+        await session_store.append_notes(7, [{"question": "Q?", "response": "An answer.", "evaluation": "Fine.", "scores": {"technical": 80.0}}])
+        await session_store.astore_summaries(7, {"messages:0-4:abc": "A summary."})
+
+    asyncio.run(run())
+    client.hset("interview_checkpoint:7", "2026-01-01T00:00:00", "{}")
+    client.expire("interview_checkpoint:7", session_store.ttl)
+
+    interview_graph.retain(7, JOB_TTL)
+
+    keys = ["interview_turns:7", "interview_analysis:7", "interview_scores:7", "interview_summaries:7", "interview_checkpoint:7"]
+    assert all(client.ttl(key) > session_store.ttl for key in keys)
+
+    # An analysis landing after completion must not cut the retention back
+    asyncio.run(session_store.append_notes(7, [{"question": "Q2?", "response": "More.", "evaluation": "Good.", "scores": {"technical": 90.0}}]))
+    assert client.ttl("interview_analysis:7") > session_store.ttl
+    assert client.ttl("interview_scores:7") > session_store.ttl
+
+
+def test_writes_during_the_interview_refresh_the_ttl(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_client, "client", client)
+
+    asyncio.run(session_store.append_turns(8, [{"role": "user", "content": "First."}]))
+    client.expire("interview_turns:8", 10)
+    asyncio.run(session_store.append_turns(8, [{"role": "user", "content": "Second."}]))
+
+    assert client.ttl("interview_turns:8") == session_store.ttl
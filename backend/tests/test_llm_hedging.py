@@ -0,0 +1,31 @@
+import asyncio
+from app.config import get_settings
+from app.services.llm_batcher import LLMRequestBatcher
+from app.services.llm_service import HuggingFaceLLMService
+
+
+def test_single_prompt_batch_is_hedged(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "LLM_HEDGING_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_MS", 10.0)
+
+    service = HuggingFaceLLMService(api_url="http://127.0.0.1:1/models/test")
+    service._batcher = LLMRequestBatcher(service._agenerate_batch, max_batch_size=8, window_ms=1.0)
+    for _ in range(50):
+        service._latency.observe(0.01)
+
+    calls = []
+
+    async def post_single(prompt, max_new_tokens=None, temperature=None):
+        calls.append(prompt)
+        # The first request stalls; the hedge sent after the p95 answers
+        await asyncio.sleep(5 if len(calls) == 1 else 0)
+        return f"answer {len(calls)}"
+
+    monkeypatch.setattr(service, "_post_single", post_single)
+
+    text = asyncio.run(asyncio.wait_for(service._agenerate("Hello", max_new_tokens=10, temperature=0.1), timeout=2))
+
+    assert text == "answer 2"
+    assert len(calls) == 2
+    assert service.hedges_sent == 1 and service.hedges_won == 1
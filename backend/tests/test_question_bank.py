@@ -0,0 +1,41 @@
+import asyncio
+import threading
+from app.services.question_bank import QuestionBank
+
+
+def test_concurrent_refills_of_one_pool_run_once(monkeypatch):
+    bank = QuestionBank(pool_size=30, min_pool=10, batch_size=10)
+    calls = []
+    release = threading.Event()
+
+    async def afill(role, difficulty, target=None):
+        calls.append((role, difficulty))
+        await asyncio.to_thread(release.wait, 5)
+        return 30
+
+    monkeypatch.setattr(bank, "afill", afill)
+
+    start = threading.Barrier(16)
+
+    def take():
+        start.wait()
+        bank.schedule_refill("Software Engineer", "medium")
+
+    threads = [threading.Thread(target=take) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert bank._running_refills() == 1
+    release.set()
+    bank._refills["question_bank:Software Engineer:medium"].result(timeout=5)
+    assert len(calls) == 1
+
+    # A finished refill is pruned, and the next one for the pool runs
+    bank.schedule_refill("Data Scientist", "easy")
+    assert list(bank._refills) == ["question_bank:Data Scientist:easy"]
+    bank._refills["question_bank:Data Scientist:easy"].result(timeout=5)
+    bank.schedule_refill("Software Engineer", "medium")
+    bank._refills["question_bank:Software Engineer:medium"].result(timeout=5)
+    assert len(calls) == 3
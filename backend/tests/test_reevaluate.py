@@ -0,0 +1,24 @@
+import pytest
+from scripts.reevaluate import _answer_pairs
+
+
+def test_answer_pairs_come_from_the_notes():
+    notes = [
+        {"question": "Tell me about an incident.", "response": "The pool was too small.", "evaluation": "Good."},
+        {"question": "How would you scale reads?", "response": "Replicas and a cache.", "evaluation": "Solid."}
+    ]
+
+    assert _answer_pairs(notes) == [
+        ("Tell me about an incident.", "The pool was too small."),
+        ("How would you scale reads?", "Replicas and a cache.")
+    ]
+
+
+@pytest.mark.parametrize("notes", [
+    [],
+    [{"question": "", "response": "An answer with no question."}],
+    [{"question": "A question?", "response": "Fine."}, {"response": "Missing its question."}]
+])
+def test_answer_pairs_refuse_missing_questions(notes):
+    with pytest.raises(ValueError):
+        _answer_pairs(notes)
@@ -0,0 +1,60 @@
+import asyncio
+from app.services import evaluation_service as evaluation_module
+from app.services.evaluation_service import EvaluationService
+
+NOTES = [{"question": "Tell me about an incident.", "response": "The pool was too small.", "evaluation": "Good."}]
+HISTORY = [{"role": "user", "content": "The pool was too small."}]
+
+
+def test_unresolved_score_falls_back_to_staged_scoring(monkeypatch):
+    # technical_score stayed invalid after the structured repair pass
+    fields = {
+        "communication_score": 80.0,
+        "problem_solving_score": 70.0,
+        "confidence_score": 60.0,
+        "strengths": ["Clear"],
+        "weaknesses": ["Depth"],
+        "improvement_areas": [],
+        "recommendations": "Practice."
+    }
+
+    async def aevaluate(transcript, evaluations, role, priority):
+        return fields, {"repaired_fields": [], "unresolved_fields": ["technical_score"]}
+
+    calls = []
+
+    async def agenerate(**kwargs):
+        calls.append(kwargs["call_site"])
+        if kwargs["call_site"] == "_calculate_scores":
+            return "Communication: 10\nTechnical: 50\nProblem Solving: 10\nConfidence: 10"
+        return "Solid interview overall."
+
+    monkeypatch.setattr(evaluation_module.structured_evaluator, "aevaluate", aevaluate)
+    monkeypatch.setattr(evaluation_module.llm_service, "agenerate", agenerate)
+
+    result = asyncio.run(EvaluationService(mode="structured").aevaluate_interview(HISTORY, NOTES, "Software Engineer", {}))
+
+    assert calls == ["_generate_overall_evaluation", "_calculate_scores"]
+    assert result["technical_score"] == 50.0
+    # Only the missing dimension is taken from the staged scores
+    assert result["communication_score"] == 80.0
+    assert result["overall_score"] == 65.0
+    assert result["fallback_score_fields"] == ["technical"]
+
+
+def test_resolved_scores_need_no_fallback(monkeypatch):
+    fields = {f"{name}_score": 70.0 for name in ("communication", "technical", "problem_solving", "confidence")}
+
+    async def aevaluate(transcript, evaluations, role, priority):
+        return fields, {"repaired_fields": [], "unresolved_fields": []}
+
+    async def agenerate(**kwargs):
+        raise AssertionError("no LLM call expected")
+
+    monkeypatch.setattr(evaluation_module.structured_evaluator, "aevaluate", aevaluate)
+    monkeypatch.setattr(evaluation_module.llm_service, "agenerate", agenerate)
+
+    result = asyncio.run(EvaluationService(mode="structured").aevaluate_interview(HISTORY, NOTES, "Software Engineer", {}))
+
+    assert result["overall_score"] == 70.0
+    assert result["fallback_score_fields"] == []
@@ -0,0 +1,51 @@
+import asyncio
+import fakeredis
+from app.agents.interview_graph import interview_graph
+from app.agents.session_store import session_store
+from app.config import get_settings
+from app.services import transcript_compactor as compactor_module
+from app.services.evaluation_service import evaluation_service
+from app.utils.redis_client import redis_client
+
+ANSWER = "I owned the billing service and moved it to an event-driven design with idempotency keys. " * 4
+
+
+def test_interview_summaries_are_reused_by_the_evaluation(monkeypatch):
+    monkeypatch.setattr(redis_client, "client", fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(get_settings(), "EVAL_TRANSCRIPT_TOKEN_BUDGET", 400)
+    monkeypatch.setattr(interview_graph, "background_summaries", True)
+
+    calls = []
+
+    async def agenerate(**kwargs):
+        calls.append(kwargs["call_site"])
+        return f"Summary {len(calls)}"
+
+    monkeypatch.setattr(compactor_module.llm_service, "agenerate", agenerate)
+
+    async def run():
+        for turn in range(8):
+            await session_store.append_turns(1, [
+                {"role": "user", "content": f"{turn}: {ANSWER}"},
+                {"role": "interviewer", "content": "Thanks, that's helpful context."}
+            ])
+            await session_store.append_notes(1, [
+                {"question": f"Question {turn}?", "response": ANSWER, "evaluation": "Solid, concrete answer."}
+            ])
+        await interview_graph._summarize_in_background(1)
+        made = len(calls)
+
+        summaries = await session_store.asummaries(1)
+        await evaluation_service.asummarize_transcript(
+            await session_store.aturns(1), await session_store.anotes(1), summaries
+        )
+        return made, summaries
+
+    made, summaries = asyncio.run(run())
+
+    # Summaries were made during the interview and stored, and the
+    # evaluation needed no new ones for the same transcript
+    assert made > 0
+    assert len(summaries) == made
+    assert len(calls) == made
+    session_store.delete(1)
@@ -0,0 +1,61 @@
+import base64
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import auth, interviews
+from app.utils.database import Base, engine
+from app.utils.redis_client import redis_client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(redis_client, "client", fakeredis.FakeRedis(decode_responses=True))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(interviews.router)
+    return TestClient(app)
+
+
+def started_interview(client: TestClient):
+    token = client.post("/auth/register", json={
+        "email": "candidate@example.com", "phone": "+15550000001", "full_name": "Candidate", "password": "secret123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    interview_id = client.post("/interviews/create", json={"role": "Software Engineer"}, headers=headers).json()["id"]
+    client.post(f"/interviews/{interview_id}/start", headers=headers)
+    return interview_id, token, headers
+
+
+def receive_turn(ws):
+    events = []
+    while not events or events[-1]["type"] != "turn_metrics":
+        events.append(ws.receive_json())
+    return events
+
+
+def test_audio_end_without_audio_is_rejected(client):
+    interview_id, token, headers = started_interview(client)
+
+    with client.websocket_connect(f"/interviews/ws/{interview_id}?token={token}") as ws:
+        ws.send_json({"type": "audio_end"})
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json()["type"] == "pong"
+
+    # No turn ran, so no question was used up
+    assert client.get(f"/interviews/{interview_id}", headers=headers).json()["conversation_history"] == []
+
+
+def test_final_transcript_comes_after_every_partial(client):
+    interview_id, token, headers = started_interview(client)
+
+    with client.websocket_connect(f"/interviews/ws/{interview_id}?token={token}") as ws:
+        ws.send_json({"type": "audio_chunk", "audio": base64.b64encode(b"\0" * 64).decode("ascii"), "format": "wav"})
+        ws.send_json({"type": "audio_end"})
+        types = [event["type"] for event in receive_turn(ws)]
+
+    assert "transcript" in types
+    assert "transcript_partial" not in types[types.index("transcript"):]
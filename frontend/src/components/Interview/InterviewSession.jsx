@@ -21,7 +21,7 @@ import toast from 'react-hot-toast';
 export default function InterviewSession() {
   const { id } = useParams();
   const navigate = useNavigate();
-  const { startInterview, respondToQuestion, completeInterview } = useInterviewStore();
+  const { startInterview, respondToQuestion, completeInterview, waitForEvaluation } = useInterviewStore();
   
   const [interview, setInterview] = useState(null);
   const [currentQuestion, setCurrentQuestion] = useState('');
@@ -137,10 +137,9 @@ export default function InterviewSession() {
       
       // Check if interview is complete
       if (response.message === 'Interview completed') {
-        toast.success('Interview completed!');
-        setTimeout(() => {
-          navigate(`/evaluation/${response.evaluation_id}`);
-        }, 2000);
+        toast.success('Interview completed! Preparing your evaluation...');
+        const job = await waitForEvaluation(response.job_id);
+        navigate(`/evaluation/${job.evaluation_id}`);
         return;
       }
 
@@ -180,8 +179,9 @@ export default function InterviewSession() {
     if (window.confirm('Are you sure you want to end this interview?')) {
       try {
         const response = await completeInterview(id);
-        toast.success('Interview ended');
-        navigate(`/evaluation/${response.evaluation_id}`);
+        toast.success('Interview ended. Preparing your evaluation...');
+        const job = await waitForEvaluation(response.job_id);
+        navigate(`/evaluation/${job.evaluation_id}`);
       } catch (error) {
         toast.error('Failed to end interview');
       }
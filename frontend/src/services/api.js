@@ -73,6 +73,7 @@ export const interviewAPI = {
   start: (id) => api.post(`/interviews/${id}/start`),
   respond: (id, data) => api.post(`/interviews/${id}/respond`, data),
   complete: (id) => api.post(`/interviews/${id}/complete`),
+  evaluationStatus: (jobId) => api.get(`/interviews/evaluation-jobs/${jobId}`),
   delete: (id) => api.delete(`/interviews/${id}`),
 };
 
@@ -107,6 +107,30 @@ const useInterviewStore = create((set, get) => ({
     }
   },
 
+  // Evaluations are generated in the background; poll until the report is ready
+  waitForEvaluation: async (jobId) => {
+    set({ isLoading: true, error: null });
+    try {
+      while (true) {
+        const response = await interviewAPI.evaluationStatus(jobId);
+        if (response.data.status === 'completed') {
+          set({ isLoading: false });
+          return response.data;
+        }
+        if (response.data.status === 'failed') {
+          throw new Error(response.data.error || 'Evaluation failed');
+        }
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+      }
+    } catch (error) {
+      set({
+        error: error.response?.data?.detail || error.message || 'Failed to load evaluation',
+        isLoading: false,
+      });
+      throw error;
+    }
+  },
+
   deleteInterview: async (id) => {
     set({ isLoading: true, error: null });
     try {